@@ -8,23 +8,55 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
 from .api import DenonAvr3805ApiClient
+from .api import STATUS_QUERIES
+from .api import TRANSPORTS
+from .const import COMMAND_TIMEOUT
 from .const import CONF_HOST
 from .const import CONF_PORT
+from .const import CONF_PROXY_HOST
+from .const import CONF_PROXY_PORT
+from .const import DEFAULT_PROXY_HOST
+from .const import DEFAULT_PROXY_PORT
+from .const import DEFAULT_POLL_PLAN
 from .const import DOMAIN
+from .const import FIELD_REFRESH_COOLDOWN
+from .const import MAX_POLL_INTERVAL
+from .const import MIN_POLL_INTERVAL
 from .const import PLATFORMS
+from .const import SCENE_TIMEOUT
+from .const import STANDBY_POLL_INTERVAL
 from .const import STARTUP_MESSAGE
-
-SCAN_INTERVAL = timedelta(seconds=30)
+from .protocol import MasterVolume
+from .protocol import Mute
+from .protocol import Power
+from .protocol import Source
+from .protocol import SurroundMode
+from .proxy import FanOutProxy
+from .state import AvrState
+from .state import FIELDS
+
+# Status events the AVR pushes on its own, mapped to coordinator fields
+PUSH_FIELDS = {
+    Power: "power",
+    MasterVolume: "volume",
+    Mute: "mute",
+    Source: "input",
+    SurroundMode: "surround",
+}
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
@@ -38,14 +70,32 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     host = entry.data.get(CONF_HOST)
     port = entry.data.get(CONF_PORT)
 
-    client = DenonAvr3805ApiClient(host, port)
+    # Keep one link to ser2net open instead of reconnecting for every poll and
+    # command, shared with anything else using the same port. Status read by
+    # several users within a second is answered from memory.
+    client = TRANSPORTS.acquire(
+        host, port, config={"persistent_connection": True, "cache_ttl": 1.0}
+    )
 
     coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
     await coordinator.async_refresh()
 
     if not coordinator.last_update_success:
+        await coordinator.async_shutdown()
         raise ConfigEntryNotReady
 
+    proxy_port = entry.options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT)
+    if proxy_port:
+        # Let other tools reach the AVR through our client instead of ser2net
+        proxy = FanOutProxy(
+            client, proxy_port, host=entry.options.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST)
+        )
+        try:
+            await proxy.async_start()
+            coordinator.proxy = proxy
+        except OSError as e:
+            _LOGGER.error("Could not start the sharing proxy on port %s: %s", proxy_port, e)
+
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     platforms_to_setup = []
@@ -61,6 +111,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+def _remaining(deadline: float) -> float:
+    """Return the seconds left until a time.monotonic() deadline, at least 0."""
+    return max(deadline - time.monotonic(), 0.0)
+
+
 class DenonAvr3805DataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
@@ -68,106 +123,339 @@ class DenonAvr3805DataUpdateCoordinator(DataUpdateCoordinator):
         self,
         hass: HomeAssistant,
         client: DenonAvr3805ApiClient,
+        poll_plan: dict[str, timedelta] | None = None,
+        min_interval: timedelta = MIN_POLL_INTERVAL,
+        max_interval: timedelta = MAX_POLL_INTERVAL,
     ) -> None:
         """Initialize."""
         self.api = client
         self.platforms = []
+        self.proxy = None
+
+        # Status changes are pushed by the AVR, polling is a consistency check
+        # run per field. The coordinator ticks at the shortest field interval,
+        # scaled between min_interval and max_interval by recent activity.
+        self.poll_plan = dict(poll_plan or DEFAULT_POLL_PLAN)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._base_interval = min(self.poll_plan.values())
+        self._poll_all = True
+
+        # AvrState compares by its responses, so a poll that changes nothing
+        # does not notify listeners at all
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=self._base_interval,
+            always_update=False,
+        )
+
+        # What changed since listeners were last notified, see async_update_listeners
+        self.changed_fields = frozenset(FIELDS)
+        self.availability_changed = True
+        self._notified_data = None
+        self._notified_success = None
+
+        # Commands being confirmed in the background, see async_execute_and_refresh_field
+        self._command_generations = {}
+        self._confirmations = set()
+
+        # Fields waiting for a targeted refresh, with the time it was first requested
+        self._pending_fields = {}
+        self._field_refresh_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=FIELD_REFRESH_COOLDOWN,
+            immediate=False,
+            function=self._async_refresh_fields,
+        )
 
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=SCAN_INTERVAL)
+        self._remove_push_listener = self.api.add_listener(self._async_handle_push)
+
+    async def async_shutdown(self) -> None:
+        """Stop listening to the AVR and give the shared client back."""
+        await super().async_shutdown()
+        for task in list(self._confirmations):
+            task.cancel()
+        self._field_refresh_debouncer.async_cancel()
+        if self.proxy is not None:
+            await self.proxy.async_stop()
+            self.proxy = None
+        if self._remove_push_listener is None:
+            return
+        self._remove_push_listener()
+        self._remove_push_listener = None
+        await TRANSPORTS.async_release(self.api)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners, recording which fields changed since the previous notification.
+
+        Entities compare changed_fields with the fields they show and skip the
+        state write when none of them changed, so a poll that confirms the
+        current state does not write to the state machine and the recorder.
+        """
+        previous = self._notified_data
+        self.changed_fields = frozenset(
+            field
+            for field in FIELDS
+            if previous is None or self.data is None or previous.get(field) != self.data.get(field)
+        )
+        self.availability_changed = self.last_update_success != self._notified_success
+        self._notified_data = self.data
+        self._notified_success = self.last_update_success
+        super().async_update_listeners()
+
+    @callback
+    def _async_handle_push(self, event):
+        """Apply a status event sent by the AVR (front panel, IR remote or a command echo)."""
+        field = PUSH_FIELDS.get(type(event))
+        if field is None or self.data is None:
+            return
+        if self.data.get(field) == event.raw:
+            return
+
+        _LOGGER.debug("Pushed update from AVR: %s = %s", field, event.raw)
+        data = self.data.update({field: event.raw})
+        self._update_poll_mode(data)
+        self.async_set_updated_data(data)
+
+    async def async_execute_and_refresh_field(self, command, field, query, expected=None):
+        """Send a command, showing the state it should lead to right away.
+
+        ``expected`` (e.g. "MUON") is applied at once so the UI does not wait
+        for the serial link. The command is then sent and confirmed in the
+        background: the AVR echoes the state a control command results in
+        (MUON, MV45), and only when no echo arrives within the client's echo
+        timeout is the field queried. If the AVR reports something else its
+        value wins; if nothing confirms the command the optimistic value is
+        rolled back and a full refresh is requested.
+        """
+        previous = self.data.get(field) if self.data else None
+        if expected is not None and self.data is not None:
+            data = self.data.assume(field, expected)
+            self._update_poll_mode(data, activity=True)
+            self.async_set_updated_data(data)
+
+        # Only the latest command for a field reconciles it
+        generation = self._command_generations[field] = self._command_generations.get(field, 0) + 1
+        task = self.hass.async_create_task(
+            self._async_confirm_command(command, field, query, expected, previous, generation)
+        )
+        self._confirmations.add(task)
+        task.add_done_callback(self._confirmations.discard)
 
-    async def async_execute_and_refresh_field(self, command, field, query, settle_delay=0.3):
-        """Send a command, let the AVR settle, then confirm and push the new value immediately.
+    async def _async_confirm_command(self, command, field, query, expected, previous, generation):
+        """Send a command and reconcile the field with what the AVR reports.
 
-        Verifying on the same connection avoids waiting for the next poll cycle
-        (and its own reconnect) to reflect the change in the entity state.
+        Connecting, sending and confirming share COMMAND_TIMEOUT seconds.
+        """
+        deadline = time.monotonic() + COMMAND_TIMEOUT
+        try:
+            async with self.api.session(timeout=COMMAND_TIMEOUT):
+                value = await command(timeout=_remaining(deadline), confirm=True)
+                if generation != self._command_generations.get(field):
+                    # Superseded (possibly coalesced away), the newer command confirms
+                    return
+                if value is None:
+                    _LOGGER.debug("No echo for %s, querying it", field)
+                    value = await query(timeout=_remaining(deadline))
+        except Exception as e:  # pylint: disable=broad-except
+            _LOGGER.warning("Command for %s failed: %s", field, e)
+            value = None
+
+        if generation != self._command_generations.get(field):
+            # A newer command for this field is on its way, it will reconcile
+            return
+
+        if value is None:
+            # Could not confirm the new state, undo the guess and ask the AVR again
+            if expected is not None and self.data is not None and self.data.get(field) == expected:
+                _LOGGER.warning("Could not confirm %s, rolling back to %s", expected, previous)
+                self.async_set_updated_data(self.data.assume(field, previous))
+            await self.async_request_field_refresh(field)
+            return
+
+        if expected is not None and value != expected:
+            _LOGGER.info("AVR reported %s for %s, expected %s", value, field, expected)
+        data = (self.data or AvrState()).update({field: value})
+        self._update_poll_mode(data, activity=True)
+        self.async_set_updated_data(data)
+
+    async def async_apply_scene(self, steps, timeout: float = SCENE_TIMEOUT) -> None:
+        """Bring the AVR to a series of (field, value) states, e.g. for a scene.
+
+        Only the commands that change something are sent, in one session,
+        and the result is verified with a single batch of queries at the end.
+        Connecting, sending and verifying share ``timeout`` seconds; raises
+        HomeAssistantError if the AVR could not be reached in that time.
+        """
+        steps = list(steps)
+        deadline = time.monotonic() + timeout
+        # Values shown optimistically may never have reached the AVR
+        current = self.data.confirmed if self.data else None
+        try:
+            async with self.api.session(timeout=timeout):
+                results = await self.api.async_apply(
+                    steps, current, timeout=_remaining(deadline)
+                )
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            # Some commands may have gone out, find out where the AVR ended up
+            await self.async_request_field_refresh(*{field for field, _ in steps})
+            raise HomeAssistantError(f"Could not apply scene: {e or 'timed out'}") from e
+
+        responses = {field: value for field, value in results.items() if value is not None}
+        missing = [field for field, value in results.items() if value is None]
+        if responses:
+            data = (self.data or AvrState()).update(responses)
+            self._update_poll_mode(data, activity=True)
+            self.async_set_updated_data(data)
+        if missing:
+            await self.async_request_field_refresh(*missing)
+
+    async def async_request_field_refresh(self, *fields: str, max_age: float = 0.0) -> None:
+        """Request a refresh of just the given fields.
+
+        Requests made within FIELD_REFRESH_COOLDOWN of each other are merged
+        into one batch of queries. A field is skipped if the AVR reported it
+        after the refresh was requested (by a poll, a push or an echo) or at
+        most ``max_age`` seconds before.
         """
-        await self.api.connect()
+        since = time.monotonic() - max_age
+        for field in fields:
+            self._pending_fields[field] = min(self._pending_fields.get(field, since), since)
+        await self._field_refresh_debouncer.async_call()
+
+    async def _async_refresh_fields(self) -> None:
+        """Query the fields waiting for a targeted refresh."""
+        pending, self._pending_fields = self._pending_fields, {}
+        updated = self.data.updated if self.data else {}
+        queries = [
+            query
+            for query in STATUS_QUERIES
+            if query[0] in pending and updated.get(query[0], float("-inf")) < pending[query[0]]
+        ]
+        if not queries:
+            return
+
         try:
-            await command()
-            await asyncio.sleep(settle_delay)
-            value = await query()
-        finally:
-            await self.api.disconnect()
-
-        if value is not None:
-            self.async_set_updated_data({**(self.data or {}), field: value})
+            async with self.api.session():
+                responses = await self.api.async_query_many(queries)
+        except Exception as e:  # pylint: disable=broad-except
+            # The regular poll will catch up
+            _LOGGER.debug("Field refresh failed: %s", e)
+            return
+
+        responses = {field: value for field, value in responses.items() if value is not None}
+        if not responses:
+            return
+        data = (self.data or AvrState()).update(responses)
+        self._update_poll_mode(data)
+        self.async_set_updated_data(data)
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh of every field, e.g. after a command changed the AVR state."""
+        self._poll_all = True
+        await super().async_request_refresh()
+
+    @property
+    def in_standby(self) -> bool:
+        """Return True if the AVR last reported standby."""
+        return self.data is not None and self.data.power is False
+
+    def _update_poll_mode(self, data: AvrState, activity: bool | None = None) -> None:
+        """Pick the poll interval for the state about to replace the current one.
+
+        In standby only power is polled, slowly. Otherwise the interval drops
+        to min_interval when something changed (a push, a command or a poll
+        that found a difference) and doubles with every quiet poll up to
+        max_interval. Called before the new state is set, so the next refresh
+        is already scheduled with the new interval.
+        """
+        standby = data.power is False
+        if self.in_standby and not standby:
+            # Coming out of standby: the other fields are stale, refresh them all
+            self._poll_all = True
+        if activity is None:
+            activity = data != self.data
+
+        if standby:
+            interval = STANDBY_POLL_INTERVAL
+        elif activity:
+            interval = self.min_interval
+        else:
+            interval = min(max(self.update_interval * 2, self.min_interval), self.max_interval)
+
+        if interval != self.update_interval:
+            _LOGGER.debug(
+                "AVR %s, polling every %s", "in standby" if standby else "on", interval
+            )
+            self.update_interval = interval
+
+    def _due_queries(self, now: float):
+        """Return the status queries whose field is due for a poll.
+
+        A field is due once its interval has passed since the AVR last
+        reported it, whether in a poll, a push or a command confirmation.
+        Requested refreshes poll every field. In standby only power is polled,
+        everything else is ignored or answered with stale values. Otherwise
+        the plan is scaled with the current tick, so every field is polled
+        faster while the AVR is in use. Half a tick of slack keeps a field
+        from slipping a whole cycle when the timer fires a little early.
+        """
+        if self.in_standby:
+            self._poll_all = False
+            plan = {"power": STANDBY_POLL_INTERVAL}
+        elif self._poll_all or self.data is None:
+            self._poll_all = False
+            return [query for query in STATUS_QUERIES if query[0] in self.poll_plan]
         else:
-            # Could not confirm the new state on this connection, fall back to a full poll.
-            await self.async_request_refresh()
+            scale = self.update_interval / self._base_interval
+            plan = {field: interval * scale for field, interval in self.poll_plan.items()}
+
+        slack = self.update_interval.total_seconds() / 2
+        due = []
+        for query in STATUS_QUERIES:
+            interval = plan.get(query[0])
+            if interval is None:
+                continue
+            updated = self.data.updated.get(query[0])
+            if updated is None or now - updated + slack >= interval.total_seconds():
+                due.append(query)
+        return due
 
     async def _async_update_data(self):
         """Enhanced update with better error handling and retry logic."""
+        queries = self._due_queries(time.monotonic())
+        if not queries:
+            # Every field was refreshed recently (e.g. pushed by the AVR)
+            return self.data
+
         try:
-            # Use enhanced connection with retry logic
-            if not await self.api.connect_with_retry():
-                raise UpdateFailed("Failed to connect to AVR after retries")
-
-            # Give AVR time to be ready after connection
-            await asyncio.sleep(0.3)  # Reduced from 0.5s for efficiency
-
-            data = {}
-
-            # Query power status with fallback
-            try:
-                power_status = await self.api.async_get_power_status()
-                if not power_status:
-                    # Try alternative power query
-                    power_status = await self.api.async_get_power_alt()
-                data["power"] = power_status
-                _LOGGER.debug("Power status query returned: %s", power_status)
-            except Exception as e:
-                _LOGGER.debug("Power status query failed: %s", e)
-                data["power"] = None
-
-            # Small delay between queries to avoid overwhelming the AVR
-            await asyncio.sleep(0.1)  # Reduced from 0.2s
-
-            try:
-                volume_status = await self.api.async_get_volume()
-                if not volume_status:
-                    # Try alternative volume query
-                    volume_status = await self.api.async_get_volume_alt()
-                data["volume"] = volume_status
-                _LOGGER.debug("Volume status query returned: %s", volume_status)
-            except Exception as e:
-                _LOGGER.debug("Volume status query failed: %s", e)
-                data["volume"] = None
-
-            # Small delay between queries to avoid overwhelming the AVR
-            await asyncio.sleep(0.1)
-
-            try:
-                mute_status = await self.api.async_get_mute_status()
-                data["mute"] = mute_status
-                _LOGGER.debug("Mute status query returned: %s", mute_status)
-            except Exception as e:
-                _LOGGER.debug("Mute status query failed: %s", e)
-                data["mute"] = None
-
-            await asyncio.sleep(0.1)
-
-            try:
-                input_status = await self.api.async_get_input()
-                data["input"] = input_status
-                _LOGGER.debug("Input status query returned: %s", input_status)
-            except Exception as e:
-                _LOGGER.debug("Input status query failed: %s", e)
-                data["input"] = None
-
-            await asyncio.sleep(0.1)
-
-            # Try additional queries that might work better with this AVR
-            try:
-                # Some AVRs respond better to different query formats
-                alt_input = await self.api._send_command("SI ?")
-                if alt_input and alt_input != input_status:
-                    _LOGGER.debug("Alternative input query returned: %s", alt_input)
-                    if input_status is None and alt_input:
-                        data["input"] = alt_input
-            except Exception as e:
-                _LOGGER.debug("Alternative input query failed: %s", e)
-
-            await self.api.disconnect()
+            # Share the link with commands that may be running at the same time
+            was_connected = self.api.is_connected
+            async with self.api.session():
+                # Give AVR time to be ready after a fresh connection
+                if not was_connected:
+                    await asyncio.sleep(self.api.settle_delay)
+
+                # Send the due status queries at once and match the answers by prefix
+                data = dict(await self.api.async_query_many(queries))
+
+                if "power" in data and not data["power"]:
+                    try:
+                        # Try alternative power query
+                        data["power"] = await self.api.async_get_power_alt()
+                    except Exception as e:
+                        _LOGGER.debug("Alternative power query failed: %s", e)
+
+                if "volume" in data and not data["volume"]:
+                    try:
+                        # Try alternative volume query
+                        data["volume"] = await self.api.async_get_volume_alt()
+                    except Exception as e:
+                        _LOGGER.debug("Alternative volume query failed: %s", e)
 
             # Log diagnostics periodically for troubleshooting
             if self.api.connection_stats.total_commands % 50 == 0:
@@ -175,28 +463,18 @@ class DenonAvr3805DataUpdateCoordinator(DataUpdateCoordinator):
                 _LOGGER.info("Connection stats - Success rate: %.1f%%, Commands: %d, Failures: %d",
                            stats.success_rate * 100, stats.total_commands, stats.failed_commands)
 
-            _LOGGER.debug("Coordinator update completed - Power: %s, Volume: %s, Mute: %s, Input: %s",
-                         data.get("power"), data.get("volume"), data.get("mute"), data.get("input"))
-            return data
+            _LOGGER.debug("Coordinator update completed - polled %s",
+                         ", ".join(f"{field}: {value}" for field, value in data.items()) or "nothing")
+            state = (self.data or AvrState()).update(data)
+            self._update_poll_mode(state)
+            return state
 
-        except UpdateFailed:
-            # Re-raise UpdateFailed exceptions
-            raise
         except ConnectionError as exception:
+            # Leave the link to the client: a command may still be using it
             _LOGGER.warning("Connection failed during update: %s", exception)
-            # Ensure we're properly disconnected
-            try:
-                await self.api.disconnect()
-            except Exception:
-                pass
             raise UpdateFailed(f"Connection failed: {exception}") from exception
         except Exception as exception:
             _LOGGER.error("Unexpected error during update: %s", exception)
-            # Ensure we're properly disconnected on any error
-            try:
-                await self.api.disconnect()
-            except Exception:
-                pass
             raise UpdateFailed(f"Unexpected error: {exception}") from exception
 
     def get_diagnostics(self):
@@ -206,9 +484,10 @@ class DenonAvr3805DataUpdateCoordinator(DataUpdateCoordinator):
                 "last_update_success": self.last_update_success,
                 "last_exception": str(self.last_exception) if self.last_exception else None,
                 "update_interval": str(self.update_interval),
-                "data": self.data if self.data else {},
+                "data": self.data.as_dict() if self.data else {},
             },
             "api": self.api.get_diagnostics(),
+            "proxy": self.proxy.get_diagnostics() if self.proxy else None,
         }
 
 
@@ -229,6 +508,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
     if unloaded:
         hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
 
     return unloaded
 
@@ -242,13 +522,22 @@ async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     current_platforms = set(coordinator.platforms)
     new_platforms = {platform for platform in PLATFORMS if entry.options.get(platform, True)}
 
-    if current_platforms != new_platforms:
-        # Platform configuration changed, need to reload
+    # The shared client is tied to its host and port, a new endpoint needs a new one
+    new_endpoint = (entry.data.get(CONF_HOST), entry.data.get(CONF_PORT))
+    proxy_port = coordinator.proxy.port if coordinator.proxy else DEFAULT_PROXY_PORT
+    proxy_host = coordinator.proxy.host if coordinator.proxy else None
+
+    if (
+        current_platforms != new_platforms
+        or coordinator.api.endpoint != new_endpoint
+        or entry.options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT) != proxy_port
+        or (
+            proxy_host is not None
+            and entry.options.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST) != proxy_host
+        )
+    ):
+        # Platform, connection or proxy configuration changed, need to reload
         await async_reload_entry(hass, entry)
-    else:
-        # Only connection data changed, just update coordinator
-        coordinator.api.host = entry.data.get(CONF_HOST)
-        coordinator.api.port = entry.data.get(CONF_PORT)
 
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -5,11 +5,84 @@ import asyncio
 import logging
 import socket
 import time
+from collections import deque
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Deque, Iterable, List, Mapping, Tuple
+
+from . import protocol
+from .protocol import Event
+from .protocol import MasterVolume
+from .breaker import BREAKER_HALF_OPEN
+from .breaker import BREAKER_OPEN
+from .breaker import CircuitBreaker
+from .breaker import CircuitOpenError
+from .scheduler import AdaptivePacer
+from .scheduler import CommandScheduler
+from .scheduler import LinkThrottle
+from .scheduler import PRIORITY_BACKGROUND
+from .scheduler import PRIORITY_INTERACTIVE
+from .state import AvrState
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
+# (field name, query command, expected response prefix) for a full status refresh
+STATUS_QUERIES: List[Tuple[str, str, str]] = [
+    ("power", "PW?", "PW"),
+    ("volume", "MV?", "MV"),
+    ("mute", "MU?", "MU"),
+    ("input", "SI?", "SI"),
+    ("surround", "MS?", "MS"),
+]
+
+# Command groups where a queued absolute set is superseded by a newer one
+COALESCE_GROUPS = ("MV", "SI")
+
+# Relative volume commands and the step they make on the 0-98 scale
+VOLUME_STEPS = {"MVUP": 1, "MVDOWN": -1}
+
+# Largest chunk of stale input taken in one read after connecting
+RESYNC_READ_SIZE = 64 * 1024
+
+
+def scene_command(field: str, value: Any) -> str:
+    """Return the command that sets a status field to a value.
+
+    Each command is also the status line the AVR reports once it is set
+    (PWON, MV40, SIDVD, ...), so it can be compared with the known state.
+    """
+    if field == "power":
+        return "PWON" if value else "PWSTANDBY"
+    if field == "volume":
+        return protocol.encode_volume(float(value)).decode("ascii").rstrip("\r")
+    if field == "mute":
+        return "MUON" if value else "MUOFF"
+    if field == "input":
+        return f"SI{value}"
+    if field == "surround":
+        return f"MS{value}"
+    raise ValueError(f"Unknown status field: {field}")
+
+
+def _deadline(timeout: Optional[float]) -> Optional[float]:
+    """Turn an overall timeout into a deadline on the event loop clock."""
+    if timeout is None:
+        return None
+    return asyncio.get_running_loop().time() + timeout
+
+
+def _budget(deadline: Optional[float], limit: Optional[float] = None) -> Optional[float]:
+    """Return how long the next step may take: its own limit, capped by the deadline.
+
+    Raises asyncio.TimeoutError once the deadline has passed.
+    """
+    if deadline is None:
+        return limit
+    remaining = deadline - asyncio.get_running_loop().time()
+    if remaining <= 0:
+        raise asyncio.TimeoutError
+    return remaining if limit is None else min(limit, remaining)
+
 
 @dataclass
 class ConnectionStats:
@@ -18,6 +91,9 @@ class ConnectionStats:
     failed_connections: int = 0
     total_commands: int = 0
     failed_commands: int = 0
+    coalesced_commands: int = 0
+    cache_hits: int = 0
+    shared_queries: int = 0
     consecutive_failures: int = 0
     last_successful_connection: Optional[float] = None
     last_failed_connection: Optional[float] = None
@@ -36,6 +112,116 @@ class ConnectionStats:
         return self.consecutive_failures < 3 and self.success_rate > 0.7
 
 
+class ResponseRouter:
+    """Deliver received lines to the queries waiting for them.
+
+    Waiters are indexed by the two-letter command group every Denon response
+    starts with (PW, MV, MU, SI, ...), so routing a line is a dict lookup.
+    Waiters for the same group are served in the order they registered.
+    """
+
+    KEY_LENGTH = 2
+
+    def __init__(self) -> None:
+        """Initialize an empty router."""
+        self._waiters: Dict[str, Deque[Tuple[str, asyncio.Future]]] = {}
+
+    @property
+    def pending(self) -> int:
+        """Return the number of queries waiting for a response."""
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def register(self, prefix: str) -> asyncio.Future:
+        """Return a future resolved with the next line starting with prefix."""
+        future = asyncio.get_running_loop().create_future()
+        key = prefix[:self.KEY_LENGTH]
+        self._waiters.setdefault(key, deque()).append((prefix, future))
+        return future
+
+    def discard(self, prefix: str, future: asyncio.Future) -> None:
+        """Stop waiting for a response, e.g. after a timeout."""
+        key = prefix[:self.KEY_LENGTH]
+        waiters = self._waiters.get(key)
+        if not waiters:
+            return
+        try:
+            waiters.remove((prefix, future))
+        except ValueError:
+            pass
+        if not waiters:
+            del self._waiters[key]
+
+    def deliver(self, line: str) -> bool:
+        """Resolve the oldest waiter matching line, return False if there is none."""
+        key = line[:self.KEY_LENGTH]
+        waiters = self._waiters.get(key)
+        if not waiters:
+            return False
+        for entry in waiters:
+            prefix, future = entry
+            if line.startswith(prefix) and not future.done():
+                waiters.remove(entry)
+                if not waiters:
+                    del self._waiters[key]
+                future.set_result(line)
+                return True
+        return False
+
+    def close(self) -> None:
+        """Resolve every waiter with None, the connection they were waiting on is gone."""
+        waiters, self._waiters = self._waiters, {}
+        for entries in waiters.values():
+            for _, future in entries:
+                if not future.done():
+                    future.set_result(None)
+
+
+class StatusCache:
+    """Remember the latest status line of each command group for a short while.
+
+    Every status line the AVR sends (replies, pushes and command echoes) is
+    stored under its two-letter command group, so a query asked again within
+    the group's time to live can be answered without touching the link.
+    """
+
+    KEY_LENGTH = ResponseRouter.KEY_LENGTH
+
+    def __init__(self, ttl: float = 0.0, ttls: Optional[Dict[str, float]] = None) -> None:
+        """Initialize, ``ttls`` overrides the default ``ttl`` per command group."""
+        self._ttl = ttl
+        self._ttls = dict(ttls or {})
+        self._lines: Dict[str, Tuple[str, float]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if any command group is cached."""
+        return self._ttl > 0 or any(ttl > 0 for ttl in self._ttls.values())
+
+    def get(self, prefix: str) -> Optional[str]:
+        """Return the cached line starting with prefix if it is still fresh."""
+        key = prefix[:self.KEY_LENGTH]
+        entry = self._lines.get(key)
+        if entry is None:
+            return None
+        line, stored = entry
+        if time.monotonic() - stored > self._ttls.get(key, self._ttl) or not line.startswith(prefix):
+            return None
+        return line
+
+    def put(self, line: str) -> None:
+        """Store a status line received from the AVR."""
+        key = line[:self.KEY_LENGTH]
+        if self._ttls.get(key, self._ttl) > 0:
+            self._lines[key] = (line, time.monotonic())
+
+    def invalidate(self, group: Optional[str] = None) -> None:
+        """Forget one command group, or everything."""
+        if group is None:
+            self._lines.clear()
+        else:
+            self._lines.pop(group[:self.KEY_LENGTH], None)
+
+
 class DenonAvr3805ApiClient:
     def __init__(self, host: str, port: int, config: Optional[Dict[str, Any]] = None) -> None:
         """Initialize the API client for TCP connection to ser2net."""
@@ -43,20 +229,92 @@ class DenonAvr3805ApiClient:
         self._port = port
         self._reader: Optional[asyncio.StreamReader] = None
         self._writer: Optional[asyncio.StreamWriter] = None
-        self._lock = asyncio.Lock()  # To serialize commands
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._last_activity = time.monotonic()
+
+        # Leases on the shared link, see session()
+        self._connect_lock = asyncio.Lock()
+        self._leases = 0
+        self._idle_close_task: Optional[asyncio.Task] = None
+
+        # Replies go to the query waiting for them, everything else to the listeners
+        self._router = ResponseRouter()
+        self._listeners: List[Callable[[Event], None]] = []
+        self._monitors: List[Callable[[Event], None]] = []
+
+        # Queries currently on the wire, shared by identical queries asked meanwhile
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Bookkeeping for coalescing queued volume and input commands
+        self._set_generations: Dict[str, int] = {}
+        self._queued_sets: Dict[str, int] = {}
+        self._volume: Optional[int] = None         # Last volume reported by (or sent to) the AVR
+        self._volume_target: Optional[int] = None  # Volume once queued MV commands are sent
 
         # Enhanced configuration with defaults
         self._config = {
             'connection_timeout': 8.0,      # Increased from 5s
             'read_timeout': 3.0,
             'command_timeout': 10.0,
+            'echo_timeout': 0.5,             # How long a confirmed control command waits for its echo
+            'power_on_delay': 1.0,           # The AVR ignores commands for a moment after leaving standby
             'max_retries': 3,
             'retry_delay': 1.0,
             'exponential_backoff': True,
             'max_backoff': 30.0,
+            'persistent_connection': False,  # Keep one link open across polls and commands
+            'resync_timeout': 0.05,          # How long to wait for stale input after connecting
+            'keepalive_interval': 60.0,      # Probe the link after this many idle seconds
+            'idle_timeout': 5.0,             # Close a non-persistent link this long after the last lease
+            'max_queue_depth': 16,           # Commands allowed to wait for the link
+            'interactive_queue_timeout': 5.0,
+            'background_queue_timeout': 10.0,
+            'command_gap': 0.1,              # Initial pacing, adapted to measured response times
+            'min_command_gap': 0.05,
+            'max_command_gap': 0.5,
+            'settle_delay': 0.3,
+            'min_settle_delay': 0.05,
+            'max_settle_delay': 1.0,
+            'baud_rate': 9600,               # AVR serial port, 8N1 so 10 bits per byte
+            'command_cost': 0.05,            # Time the AVR needs to process one command
+            'write_burst': 0.0,              # Link time that may be sent ahead of the throttle
+            'cache_ttl': 0.0,                # Answer repeated queries from memory for this long, 0 = off
+            'cache_ttls': {},                # Per command group overrides, e.g. {"PW": 1.0}
+            'breaker_threshold': 2,          # Failed connects before calls fail fast
+            'breaker_reset_timeout': 30.0,   # First wait before probing, doubled per failed probe
+            'breaker_max_reset_timeout': 300.0,
             **(config or {})
         }
 
+        # Serialize access to the link, user commands go ahead of polling
+        self._scheduler = CommandScheduler(
+            max_queue_depth=self._config['max_queue_depth'],
+            timeouts={
+                PRIORITY_INTERACTIVE: self._config['interactive_queue_timeout'],
+                PRIORITY_BACKGROUND: self._config['background_queue_timeout'],
+            },
+        )
+        self._pacer = AdaptivePacer(
+            command_gap=self._config['command_gap'],
+            min_command_gap=self._config['min_command_gap'],
+            max_command_gap=self._config['max_command_gap'],
+            settle_delay=self._config['settle_delay'],
+            min_settle_delay=self._config['min_settle_delay'],
+            max_settle_delay=self._config['max_settle_delay'],
+        )
+        self._throttle = LinkThrottle(
+            baud_rate=self._config['baud_rate'],
+            command_cost=self._config['command_cost'],
+            burst=self._config['write_burst'],
+        )
+        self._cache = StatusCache(self._config['cache_ttl'], self._config['cache_ttls'])
+        self._breaker = CircuitBreaker(
+            failure_threshold=self._config['breaker_threshold'],
+            reset_timeout=self._config['breaker_reset_timeout'],
+            max_reset_timeout=self._config['breaker_max_reset_timeout'],
+        )
+
         # Connection statistics
         self._stats = ConnectionStats()
 
@@ -65,33 +323,128 @@ class DenonAvr3805ApiClient:
         """Get connection statistics."""
         return self._stats
 
+    @property
+    def endpoint(self) -> Tuple[str, int]:
+        """Return the (host, port) of the ser2net server this client talks to."""
+        return (self._host, self._port)
+
+    @property
+    def breaker_state(self) -> str:
+        """Return the circuit breaker state (closed, open or half_open)."""
+        return self._breaker.state
+
+    @property
+    def settle_delay(self) -> float:
+        """Time to let the AVR settle after connecting or a control command."""
+        return self._pacer.settle_delay
+
     @property
     def is_connected(self) -> bool:
         """Check if currently connected."""
         return (self._writer is not None and
-                not self._writer.is_closing())
+                not self._writer.is_closing() and
+                self._reader is not None and
+                not self._reader.at_eof())
+
+    def add_listener(
+        self, callback: Callable[[Event], None], include_replies: bool = False
+    ) -> Callable[[], None]:
+        """Register a callback for status lines no query is waiting for.
+
+        This includes unsolicited updates triggered from the front panel or the
+        IR remote and command echoes. With ``include_replies`` the callback
+        also sees the replies to queries, i.e. every line the AVR sends. The
+        callback receives the parsed protocol event. Returns a function that
+        removes the listener again.
+        """
+        listeners = self._monitors if include_replies else self._listeners
+        listeners.append(callback)
 
-    async def connect(self) -> None:
-        """Establish connection to ser2net with retry logic."""
-        success = await self.connect_with_retry()
+        def remove_listener() -> None:
+            if callback in listeners:
+                listeners.remove(callback)
+
+        return remove_listener
+
+    @property
+    def is_persistent(self) -> bool:
+        """Return True if the connection is kept open between commands."""
+        return self._config['persistent_connection']
+
+    async def connect(self, timeout: Optional[float] = None) -> None:
+        """Establish connection to ser2net with retry logic, within ``timeout`` seconds overall."""
+        await self._connect(_deadline(timeout))
+
+    async def _connect(self, deadline: Optional[float]) -> None:
+        """Connect unless already connected, raising ConnectionError on failure."""
+        success = await self._ensure_connected(deadline)
         if not success:
+            if self._breaker.state == BREAKER_OPEN:
+                raise CircuitOpenError(
+                    f"{self._host}:{self._port} is unreachable, "
+                    f"next attempt in {self._breaker.retry_in:.0f}s"
+                )
             raise ConnectionError(f"Failed to connect to {self._host}:{self._port} after retries")
 
-    async def connect_with_retry(self) -> bool:
-        """Connect with retry logic and exponential backoff."""
-        if self.is_connected:
+    async def connect_with_retry(self, timeout: Optional[float] = None) -> bool:
+        """Connect with retry logic and exponential backoff.
+
+        Concurrent callers wait for the attempt already in progress instead of
+        opening (and tearing down) a second connection. While the circuit
+        breaker is open this returns False without trying; when it is
+        half-open a single attempt is made as the probe. Retries and backoff
+        stop early rather than run past ``timeout``.
+        """
+        return await self._ensure_connected(_deadline(timeout))
+
+    async def _ensure_connected(self, deadline: Optional[float]) -> bool:
+        """Connect unless already connected, giving up at the deadline."""
+        if self.is_connected and not self._connect_lock.locked():
+            # Otherwise the link may be being replaced or closed, wait for that first
             return True
 
-        max_retries = self._config['max_retries']
+        try:
+            await asyncio.wait_for(self._connect_lock.acquire(), _budget(deadline))
+        except asyncio.TimeoutError:
+            _LOGGER.debug("Deadline passed waiting for a connection attempt in progress")
+            return False
+
+        try:
+            if self.is_connected:
+                return True
+            if not self._breaker.allow():
+                _LOGGER.debug("Circuit open, not connecting for another %.0fs",
+                              self._breaker.retry_in)
+                return False
+
+            probing = self._breaker.state == BREAKER_HALF_OPEN
+            connected = False
+            try:
+                connected = await self._connect_with_retry(
+                    1 if probing else self._config['max_retries'], deadline
+                )
+            finally:
+                if connected:
+                    self._breaker.record_success()
+                else:
+                    self._breaker.record_failure()
+            return connected
+        finally:
+            self._connect_lock.release()
+
+    async def _connect_with_retry(self, max_retries: int, deadline: Optional[float] = None) -> bool:
+        """Run the connection attempts, with the connect lock held."""
         base_delay = self._config['retry_delay']
 
         for attempt in range(max_retries):
             try:
-                success = await self._attempt_connection()
+                success = await self._attempt_connection(deadline)
                 if success:
                     self._stats.successful_connections += 1
                     self._stats.consecutive_failures = 0
                     self._stats.last_successful_connection = time.time()
+                    if self.is_persistent:
+                        self._start_keepalive()
                     return True
 
             except Exception as e:
@@ -105,6 +458,13 @@ class DenonAvr3805ApiClient:
                 else:
                     delay = base_delay
 
+                try:
+                    if _budget(deadline, delay) < delay:
+                        _LOGGER.debug("Not enough time left for retry %d/%d", attempt + 2, max_retries)
+                        break
+                except asyncio.TimeoutError:
+                    break
+
                 _LOGGER.debug("Waiting %.1fs before retry %d/%d",
                             delay, attempt + 2, max_retries)
                 await asyncio.sleep(delay)
@@ -115,7 +475,7 @@ class DenonAvr3805ApiClient:
         self._stats.last_failed_connection = time.time()
         return False
 
-    async def _attempt_connection(self) -> bool:
+    async def _attempt_connection(self, deadline: Optional[float] = None) -> bool:
         """Single connection attempt."""
         try:
             # Close any existing connection
@@ -124,7 +484,22 @@ class DenonAvr3805ApiClient:
             # Establish new connection with enhanced timeout
             self._reader, self._writer = await asyncio.wait_for(
                 asyncio.open_connection(self._host, self._port),
-                timeout=self._config['connection_timeout']
+                timeout=_budget(deadline, self._config['connection_timeout'])
+            )
+            self._last_activity = time.monotonic()
+
+            if self.is_persistent:
+                # Let the OS detect a dead peer on a link that may sit idle for hours
+                sock = self._writer.get_extra_info("socket")
+                if sock is not None:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+            discarded, mid_line = await self._resync(self._reader)
+            if discarded:
+                _LOGGER.debug("Discarded %d stale bytes after connecting", discarded)
+
+            self._reader_task = asyncio.get_running_loop().create_task(
+                self._reader_loop(self._reader, skip_first_line=mid_line)
             )
 
             _LOGGER.info("Successfully connected to Denon AVR at %s:%s",
@@ -136,8 +511,43 @@ class DenonAvr3805ApiClient:
             _LOGGER.debug("Connection attempt failed: %s", e)
             return False
 
+    async def _resync(self, reader: asyncio.StreamReader) -> Tuple[int, bool]:
+        """Drop what the link buffered before we connected, ending on a line boundary.
+
+        ser2net hands a new client whatever the AVR sent while nobody was
+        connected, often starting mid-line. All of it is taken in a single
+        read; if that ends mid-line the rest of the line is dropped too, so
+        the reader loop starts aligned and stale status cannot be taken as
+        the reply to the first query. Returns the number of bytes dropped and
+        whether the link is still mid-line because the rest did not arrive in
+        time, in which case the reader loop has to drop its first line.
+        """
+        timeout = self._config['resync_timeout']
+        try:
+            data = await asyncio.wait_for(reader.read(RESYNC_READ_SIZE), timeout=timeout)
+        except asyncio.TimeoutError:
+            return 0, False  # Nothing buffered
+
+        discarded = len(data)
+        if data and not data.endswith(b"\r"):
+            try:
+                discarded += len(
+                    await asyncio.wait_for(reader.readuntil(b"\r"), timeout=timeout)
+                )
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                return discarded, True
+        return discarded, False
+
     async def disconnect(self) -> None:
         """Enhanced disconnect with proper cleanup."""
+        reader_task, self._reader_task = self._reader_task, None
+        if reader_task is not None and reader_task is not asyncio.current_task():
+            reader_task.cancel()
+            try:
+                await reader_task
+            except asyncio.CancelledError:
+                pass
+
         if self._writer:
             try:
                 if not self._writer.is_closing():
@@ -153,197 +563,719 @@ class DenonAvr3805ApiClient:
                 self._writer = None
                 _LOGGER.debug("Disconnected from Denon AVR")
 
-    async def _send_command(self, command: str, expected_prefix: str = None) -> Optional[str]:
-        """Enhanced command sending with better error handling."""
-        if not self.is_connected:
-            raise ConnectionError("Not connected to AVR")
+        # Nothing will answer queries still waiting on the old connection
+        self._router.close()
+        # Changes made while we are away would go unnoticed
+        self._cache.invalidate()
+
+    @asynccontextmanager
+    async def session(self, timeout: Optional[float] = None) -> AsyncIterator[DenonAvr3805ApiClient]:
+        """Lease the shared connection for a group of commands.
+
+        Polls and entity commands running at the same time share one link
+        instead of each connecting and disconnecting it under the other. The
+        first lease connects; unless the connection is persistent, the link is
+        closed once the last lease is released and ``idle_timeout`` seconds
+        pass without a new one. ``timeout`` bounds the initial connect.
+        """
+        self._leases += 1
+        self._cancel_idle_close()
+        try:
+            await self.connect(timeout)
+            yield self
+        finally:
+            self._leases -= 1
+            if not self._leases:
+                self._schedule_idle_close()
+
+    @property
+    def leases(self) -> int:
+        """Return the number of sessions currently holding the connection."""
+        return self._leases
+
+    def _schedule_idle_close(self) -> None:
+        """Close a non-persistent link after the idle timeout, unless it is leased again."""
+        if self.is_persistent or not self.is_connected:
+            return
+        self._idle_close_task = asyncio.get_running_loop().create_task(
+            self._close_when_idle()
+        )
 
-        async with self._lock:
+    def _cancel_idle_close(self) -> None:
+        """Keep the link open for a new lease."""
+        if self._idle_close_task is not None:
+            self._idle_close_task.cancel()
+            self._idle_close_task = None
+
+    async def _close_when_idle(self) -> None:
+        """Disconnect once the link has gone unleased for the idle timeout.
+
+        The close runs under the connect lock, so a session started meanwhile
+        waits for it and then connects again instead of using a link that is
+        being torn down.
+        """
+        await asyncio.sleep(self._config['idle_timeout'])
+        async with self._connect_lock:
+            # Past this point a new lease can no longer cancel the close
+            self._idle_close_task = None
+            if self._leases:
+                return
+            _LOGGER.debug("No sessions for %.1fs, closing connection", self._config['idle_timeout'])
+            await self.disconnect()
+
+    async def async_close(self) -> None:
+        """Stop the keepalive task and close the connection for good."""
+        self._cancel_idle_close()
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
             try:
-                self._stats.total_commands += 1
+                await self._keepalive_task
+            except asyncio.CancelledError:
+                pass
+            self._keepalive_task = None
+        await self.disconnect()
 
-                # Send command with carriage return
-                full_command = (command + "\r").encode()
-                _LOGGER.debug("Sending command: %s", command)
+    def _start_keepalive(self) -> None:
+        """Start the keepalive task if it is not already running."""
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.get_running_loop().create_task(
+                self._keepalive_loop()
+            )
 
-                self._writer.write(full_command)
-                await asyncio.wait_for(
-                    self._writer.drain(),
-                    timeout=self._config['command_timeout']
-                )
+    async def _keepalive_loop(self) -> None:
+        """Probe an idle persistent link and reconnect it when it has gone stale."""
+        interval = self._config['keepalive_interval']
+        while True:
+            idle = time.monotonic() - self._last_activity
+            if idle < interval:
+                await asyncio.sleep(interval - idle)
+                continue
 
-                # If no response expected (control commands), just return None
-                if expected_prefix is None:
-                    _LOGGER.debug("Control command sent (no response expected)")
-                    return None
+            try:
+                if self.is_connected:
+                    _LOGGER.debug("Connection idle for %.0fs, sending keepalive probe", idle)
+                    if await self._send_command("PW?", "PW", PRIORITY_BACKGROUND) is None:
+                        _LOGGER.debug("Keepalive probe unanswered, reconnecting")
+                        await self.disconnect()
+                if not self.is_connected:
+                    await self.connect_with_retry()
+            except Exception as e:
+                _LOGGER.debug("Keepalive probe failed: %s", e)
+                await self.disconnect()
 
-                # For status queries, read expected response with timeout
-                response = await asyncio.wait_for(
-                    self._read_expected_response(expected_prefix),
-                    timeout=self._config['command_timeout']
-                )
+            # Count the probe (or failed reconnect) as activity so we wait a full interval
+            self._last_activity = time.monotonic()
+
+    async def _query(
+        self,
+        command: str,
+        expected_prefix: str,
+        priority: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Optional[str]:
+        """Answer a status query from the cache, an identical query in flight or the AVR.
 
-                return response
+        A query that shares another's request gets its answer, or None if
+        that request failed.
+        """
+        cached = self._cache.get(expected_prefix)
+        if cached is not None:
+            self._stats.cache_hits += 1
+            return cached
 
+        pending = self._inflight.get(command)
+        if pending is not None:
+            self._stats.shared_queries += 1
+            try:
+                return await asyncio.wait_for(asyncio.shield(pending), timeout=_budget(deadline))
             except asyncio.TimeoutError:
-                self._stats.failed_commands += 1
-                _LOGGER.warning("Command timeout: %s", command)
                 return None
-            except Exception as e:
-                self._stats.failed_commands += 1
-                _LOGGER.error("Command failed %s: %s", command, e)
-                raise
 
-    async def _read_expected_response(self, expected_prefix: str) -> Optional[str]:
-        """Enhanced response reading with better timeout handling."""
-        start_time = time.time()
-        timeout = self._config['read_timeout']
+        future = self._inflight[command] = asyncio.get_running_loop().create_future()
+        response = None
+        try:
+            response = await self._send_command(command, expected_prefix, priority, deadline)
+            return response
+        finally:
+            future.set_result(response)
+            if self._inflight.get(command) is future:
+                del self._inflight[command]
 
-        while time.time() - start_time < timeout:
-            try:
-                response = await asyncio.wait_for(
-                    self._reader.readuntil(b"\r"),
-                    timeout=min(1.0, timeout - (time.time() - start_time))
+    async def _send_command(
+        self,
+        command: str,
+        expected_prefix: str = None,
+        priority: Optional[int] = None,
+        deadline: Optional[float] = None,
+        echo_prefix: Optional[str] = None,
+    ) -> Optional[str]:
+        """Enhanced command sending with better error handling.
+
+        Control commands are scheduled as interactive and queries as background
+        traffic unless a priority is given. Reconnecting, waiting for the link,
+        writing and reading the reply all share the time left until
+        ``deadline``; a command that runs out of time is given up like any
+        other timeout.
+
+        With ``echo_prefix`` a control command waits up to ``echo_timeout`` for
+        the AVR to echo the resulting state (MUON, MV45, ...) and returns it,
+        or None if no echo came. The echo then goes to the caller instead of
+        the listeners.
+        """
+        if not self.is_connected:
+            if not self.is_persistent and not self._leases:
+                raise ConnectionError("Not connected to AVR")
+            # The link dropped under a persistent connection or a live session, reconnect transparently
+            _LOGGER.debug("Connection lost, reconnecting")
+            await self._connect(deadline)
+
+        if priority is None:
+            priority = PRIORITY_INTERACTIVE if expected_prefix is None else PRIORITY_BACKGROUND
+
+        # Raw queries (e.g. "SI?" from the proxy) are sent without waiting for
+        # the reply, but they change nothing: never coalesce or invalidate on them
+        changes_state = expected_prefix is None and not command.endswith("?")
+
+        group = None
+        generation = None
+        if changes_state and command[:2] in COALESCE_GROUPS:
+            group = command[:2]
+            command = self._prepare_set_command(command)
+            if group == "SI" or command[2:].isdigit():
+                generation = self._set_generations[group] = self._set_generations.get(group, 0) + 1
+            self._queued_sets[group] = self._queued_sets.get(group, 0) + 1
+
+        self._stats.total_commands += 1
+        prefix = expected_prefix if expected_prefix is not None else echo_prefix
+        future = None
+        try:
+            async with self._scheduler.slot(priority, _budget(deadline)):
+                if generation is not None and generation != self._set_generations[group]:
+                    # A newer value for the same setting was queued while we waited
+                    self._stats.coalesced_commands += 1
+                    _LOGGER.debug("Dropping superseded command: %s", command)
+                    return None
+
+                if changes_state:
+                    # The command changes what the AVR would answer; power affects everything
+                    self._cache.invalidate(None if command.startswith("PW") else command[:2])
+
+                # Send command with carriage return
+                full_command = protocol.encode(command)
+                _LOGGER.debug("Sending command: %s", command)
+
+                # Register before writing so a fast reply cannot slip past us
+                if prefix is not None:
+                    future = self._router.register(prefix)
+                await self._pacer.wait_for_gap()
+                sent_at = asyncio.get_running_loop().time()
+                try:
+                    await self._write(full_command, deadline)
+                except (ConnectionError, OSError) as e:
+                    await self._reconnect_after_write_error(e, deadline)
+                    if prefix is not None:
+                        future = self._router.register(prefix)
+                    sent_at = asyncio.get_running_loop().time()
+                    await self._write(full_command, deadline)
+
+                if group == "MV":
+                    # A relative step leaves the volume unknown until the AVR reports it
+                    self._volume = int(command[2:4]) if generation is not None else None
+
+            # If no response expected (control commands), just return None
+            if future is None:
+                _LOGGER.debug("Control command sent (no response expected)")
+                return None
+
+            if expected_prefix is None:
+                # Not every command is echoed (e.g. one that changes nothing),
+                # so a missing echo is not a failure
+                echo = await self._read_expected_response(
+                    echo_prefix, future, deadline, self._config['echo_timeout']
                 )
+                if echo is not None:
+                    self._pacer.record_response(asyncio.get_running_loop().time() - sent_at)
+                return echo
+
+            # For status queries, wait for the router to hand us the reply
+            response = await self._read_expected_response(expected_prefix, future, deadline)
+            if response is None:
+                self._pacer.record_failure()
+            else:
+                self._pacer.record_response(asyncio.get_running_loop().time() - sent_at)
+            return response
+
+        except asyncio.TimeoutError:
+            self._stats.failed_commands += 1
+            _LOGGER.warning("Command timeout: %s", command)
+            return None
+        except Exception as e:
+            self._stats.failed_commands += 1
+            _LOGGER.error("Command failed %s: %s", command, e)
+            raise
+        finally:
+            if future is not None and not future.done():
+                self._router.discard(prefix, future)
+            if group is not None:
+                self._queued_sets[group] -= 1
+                if group == "MV" and not self._queued_sets[group]:
+                    self._volume_target = None
+
+    def _prepare_set_command(self, command: str) -> str:
+        """Track the volume a queued MV command leads to, folding relative steps if safe.
+
+        While other volume commands are still queued, MVUP/MVDOWN become an
+        absolute MVxx based on the volume the queue will leave the AVR at, so
+        they can supersede the queued ones. The step is only folded when that
+        volume is known; otherwise it is sent as is.
+        """
+        if not command.startswith("MV"):
+            return command
+
+        if command[2:].isdigit():
+            self._volume_target = int(command[2:4])
+            return command
+
+        step = VOLUME_STEPS.get(command)
+        if step is None:
+            return command
+
+        queued = self._queued_sets.get("MV", 0) > 0
+        base = self._volume_target if queued else self._volume
+        if base is None:
+            self._volume_target = None
+            return command
+
+        self._volume_target = min(max(base + step, 0), 98)
+        if not queued:
+            return command
 
-                decoded = response.decode().strip()
-                _LOGGER.debug("Received response: %s", decoded)
+        _LOGGER.debug("Folding %s into MV%02d", command, self._volume_target)
+        return f"MV{self._volume_target:02d}"
 
-                # Check if this is the expected response
-                if decoded.startswith(expected_prefix):
-                    _LOGGER.debug("Found expected response: %s", decoded)
-                    return decoded
+    async def _reader_loop(
+        self, reader: asyncio.StreamReader, skip_first_line: bool = False
+    ) -> None:
+        """Read every line from the AVR and route it to a waiting query or the listeners.
 
-                # Skip command echoes and confirmations
-                if self._should_skip_response(decoded):
-                    _LOGGER.debug("Skipping response: %s", decoded)
+        With ``skip_first_line`` the first line is dropped: it ends a line
+        whose start was discarded when resyncing.
+        """
+        try:
+            if skip_first_line:
+                line = await reader.readuntil(b"\r")
+                _LOGGER.debug("Dropped the rest of a stale line: %r", line)
+            while True:
+                line = await reader.readuntil(b"\r")
+                self._last_activity = time.monotonic()
+                event = protocol.parse(line)
+                if event is None:
                     continue
+                _LOGGER.debug("Received line: %s", event.raw)
+
+                if type(event) is MasterVolume:
+                    self._volume = int(event.level)
+                if type(event) is not Event:
+                    # A recognized status line, whether a reply, a push or an echo
+                    self._cache.put(event.raw)
+
+                # Replies go to the waiting query (and monitors), the rest to every listener
+                listeners = list(self._monitors)
+                if not self._router.deliver(event.raw):
+                    listeners += self._listeners
 
-                # Skip other unexpected responses
-                _LOGGER.debug("Skipping unexpected response: %s", decoded)
+                for listener in listeners:
+                    try:
+                        listener(event)
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception("Error in status listener for %s", event.raw)
+
+        except asyncio.IncompleteReadError:
+            _LOGGER.debug("Connection closed by the AVR")
+        except (ConnectionError, OSError, asyncio.LimitOverrunError) as e:
+            _LOGGER.debug("Error reading from the AVR: %s", e)
+
+        # The link is gone, drop it so the next command (or keepalive) reconnects
+        if self._reader is reader:
+            await self.disconnect()
 
+    async def _write(self, data: bytes, deadline: Optional[float] = None) -> None:
+        """Write data, raising ConnectionError or OSError if the link broke.
+
+        Waits for the link throttle first, so writes never outrun the serial
+        line or the AVR.
+        """
+        await self._throttle.acquire(data, _budget(deadline))
+        self._writer.write(data)
+        await asyncio.wait_for(
+            self._writer.drain(),
+            timeout=_budget(deadline, self._config['command_timeout'])
+        )
+        self._last_activity = time.monotonic()
+
+    async def _reconnect_after_write_error(
+        self, error: Exception, deadline: Optional[float]
+    ) -> None:
+        """Replace a persistent link a write failed on, or re-raise the error.
+
+        Waiters registered on the old link are resolved with None, so the
+        caller registers new ones before writing its commands again.
+        """
+        if not self.is_persistent:
+            raise error
+        _LOGGER.debug("Write failed on persistent connection (%s), reconnecting", error)
+        await self.disconnect()
+        await self._connect(deadline)
+
+    async def _read_expected_response(
+        self,
+        expected_prefix: str,
+        future: asyncio.Future,
+        deadline: Optional[float] = None,
+        limit: Optional[float] = None,
+    ) -> Optional[str]:
+        """Wait for the router to resolve a registered query, until read_timeout (or limit) or the deadline."""
+        if limit is None:
+            limit = self._config['read_timeout']
+        try:
+            response = await asyncio.wait_for(
+                asyncio.shield(future),
+                timeout=_budget(deadline, limit)
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.debug("Timeout waiting for response with prefix: %s", expected_prefix)
+            return None
+
+        if response is None:
+            _LOGGER.debug("Connection closed waiting for response with prefix: %s", expected_prefix)
+        else:
+            _LOGGER.debug("Found expected response: %s", response)
+        return response
+
+    async def async_query_many(
+        self,
+        queries: Iterable[Tuple[str, str, str]],
+        timeout: Optional[float] = None,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> Dict[str, Optional[str]]:
+        """Send several status queries in one go and collect the answers.
+
+        Each query is a (name, command, expected_prefix) tuple. The commands
+        are written back to back as fast as the link throttle allows, without
+        waiting for the answers in between. Responses are matched back to
+        their query by prefix in whatever order they arrive.
+        Each answer is awaited for at most ``read_timeout`` from the moment
+        its own query was written, and the whole call (reconnect, queueing,
+        writes and answers) is bounded by ``timeout``.
+        Queries that are not answered in time are returned as None. Answers
+        still fresh in the cache, and queries identical to one already on the
+        wire, do not go out again.
+        """
+        queries = list(queries)
+        results: Dict[str, Optional[str]] = {name: None for name, _, _ in queries}
+        if not queries:
+            return results
+
+        deadline = _deadline(timeout)
+        shared: Dict[str, asyncio.Future] = {}
+        to_send = []
+        for name, command, prefix in queries:
+            cached = self._cache.get(prefix)
+            if cached is not None:
+                self._stats.cache_hits += 1
+                results[name] = cached
+            elif command in self._inflight:
+                self._stats.shared_queries += 1
+                shared[name] = self._inflight[command]
+            else:
+                to_send.append((name, command, prefix))
+
+        if to_send:
+            loop = asyncio.get_running_loop()
+            own = {command: loop.create_future() for _, command, _ in to_send}
+            self._inflight.update(own)
+            answers: Dict[str, Optional[str]] = {}
+            try:
+                answers = await self._query_many(to_send, deadline, priority)
+                results.update(answers)
+            finally:
+                for name, command, _ in to_send:
+                    if not own[command].done():
+                        own[command].set_result(answers.get(name))
+                    if self._inflight.get(command) is own[command]:
+                        del self._inflight[command]
+
+        if shared:
+            try:
+                await asyncio.wait(shared.values(), timeout=_budget(deadline))
             except asyncio.TimeoutError:
-                _LOGGER.debug("Timeout waiting for response with prefix: %s", expected_prefix)
-                break
-            except Exception as e:
-                _LOGGER.debug("Error reading response: %s", e)
-                break
+                pass
+            for name, future in shared.items():
+                if future.done():
+                    results[name] = future.result()
 
-        _LOGGER.debug("Failed to find expected response with prefix: %s", expected_prefix)
-        return None
+        return results
+
+    async def _query_many(
+        self,
+        queries: List[Tuple[str, str, str]],
+        deadline: Optional[float],
+        priority: int,
+    ) -> Dict[str, Optional[str]]:
+        """Pipeline the given queries on the link, see async_query_many."""
+        results: Dict[str, Optional[str]] = {name: None for name, _, _ in queries}
+        if not self.is_connected:
+            if not self.is_persistent and not self._leases:
+                raise ConnectionError("Not connected to AVR")
+            await self._connect(deadline)
+
+        self._stats.total_commands += len(queries)
+        loop = asyncio.get_running_loop()
+        futures = {}
+        written_at: Dict[str, float] = {}
+        answered_at = []
+        sent_at = loop.time()
+
+        def record_answer(future: asyncio.Future) -> None:
+            if future.result() is not None:
+                answered_at.append(loop.time())
+
+        def register() -> None:
+            for name, _, prefix in queries:
+                futures[name] = self._router.register(prefix)
+                futures[name].add_done_callback(record_answer)
+
+        async def write_all() -> None:
+            for name, command, _ in queries:
+                await self._write(protocol.encode(command), deadline)
+                written_at[name] = loop.time()
+
+        try:
+            async with self._scheduler.slot(priority, _budget(deadline)):
+                _LOGGER.debug("Sending queries: %s", ", ".join(c for _, c, _ in queries))
+
+                register()
+                await self._pacer.wait_for_gap()
+                sent_at = loop.time()
+                try:
+                    await write_all()
+                except (ConnectionError, OSError) as e:
+                    # Queries already written went out on the dead link, send them all again
+                    await self._reconnect_after_write_error(e, deadline)
+                    register()
+                    sent_at = loop.time()
+                    await write_all()
+
+            # Each waiter is resolved by the router as its reply arrives, in any
+            # order, and given up once its own read_timeout has passed
+            expires = {
+                name: written_at[name] + self._config['read_timeout'] for name in futures
+            }
+            pending = futures
+            while True:
+                now = loop.time()
+                pending = {
+                    name: future
+                    for name, future in pending.items()
+                    if not future.done() and expires[name] > now
+                }
+                if not pending:
+                    break
+                await asyncio.wait(
+                    pending.values(),
+                    timeout=_budget(deadline, min(expires[name] for name in pending) - now),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+        except asyncio.TimeoutError:
+            # Never got the link, the write stalled or the deadline passed
+            _LOGGER.warning("Queries timed out: %s", ", ".join(results))
+        except Exception as e:
+            self._stats.failed_commands += len(queries)
+            _LOGGER.error("Queries failed %s: %s", ", ".join(futures), e)
+            raise
+        finally:
+            for (name, _, prefix) in queries:
+                future = futures.get(name)
+                if future is not None and not future.done():
+                    self._router.discard(prefix, future)
+
+        for name, future in futures.items():
+            if future.done():
+                results[name] = future.result()
+
+        # The AVR answers pipelined queries one after another, so the spacing
+        # between consecutive answers is the round trip of each of them
+        previous = sent_at
+        for answered in sorted(answered_at):
+            self._pacer.record_response(answered - previous)
+            previous = answered
+
+        missing = [name for name, value in results.items() if value is None]
+        for _ in missing:
+            self._pacer.record_failure()
+        if missing:
+            self._stats.failed_commands += len(missing)
+            _LOGGER.debug("No response for queries: %s", ", ".join(missing))
+
+        return results
+
+    async def async_apply(
+        self,
+        steps: Iterable[Tuple[str, Any]],
+        current: Optional[Mapping[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Optional[str]]:
+        """Bring the AVR to a series of (field, value) states in one go.
+
+        Steps are applied in order, skipping those ``current`` (the status
+        lines the AVR reported per field) says are already in place; values
+        are compared parsed, so ZMON counts as PWON. The commands are
+        written back to back without waiting for answers, except that
+        powering on waits for the AVR to come out of standby; what was known
+        about the other fields is dropped then, as it may be stale. The
+        result is verified once at the end with one batch of status queries,
+        whose answers are returned per field.
+        """
+        deadline = _deadline(timeout)
+        steps = [(field, scene_command(field, value)) for field, value in steps]
+        known = AvrState(current)
 
-    def _should_skip_response(self, response: str) -> bool:
-        """Determine if response should be skipped."""
-        skip_patterns = [
-            "PW?", "MV?", "MU?", "SI?", "SI ?", "CV?", "ZM?",
-            "PWON", "PWSTANDBY", "MUON", "MUOFF"  # Command confirmations
-        ]
-        return response in skip_patterns
+        for field, command in steps:
+            if known.matches(field, command):
+                continue
+            if command == "PWON":
+                await self._send_command(command, deadline=deadline, echo_prefix="PW")
+                await asyncio.sleep(_budget(deadline, self._config['power_on_delay']))
+                known = AvrState()
+            else:
+                await self._send_command(command, deadline=deadline)
+            known = known.assume(field, command)
 
-    async def async_power_on(self) -> None:
-        """Turn the AVR on."""
-        await self._send_command("PWON")
+        fields = {field for field, _ in steps}
+        return await self.async_query_many(
+            [query for query in STATUS_QUERIES if query[0] in fields],
+            timeout=_budget(deadline),
+            priority=PRIORITY_INTERACTIVE,
+        )
 
-    async def async_power_off(self) -> None:
-        """Turn the AVR to standby."""
-        await self._send_command("PWSTANDBY")
+    async def _control(
+        self, command: str, timeout: Optional[float], confirm: bool
+    ) -> Optional[str]:
+        """Send a control command, waiting for the echo of its command group if confirm is set."""
+        return await self._send_command(
+            command,
+            deadline=_deadline(timeout),
+            echo_prefix=command[:2] if confirm else None,
+        )
 
-    async def async_get_power_status(self) -> Optional[str]:
+    async def async_power_on(
+        self, timeout: Optional[float] = None, confirm: bool = False
+    ) -> Optional[str]:
+        """Turn the AVR on, returning the AVR's echo when confirm is set."""
+        return await self._control("PWON", timeout, confirm)
+
+    async def async_power_off(
+        self, timeout: Optional[float] = None, confirm: bool = False
+    ) -> Optional[str]:
+        """Turn the AVR to standby, returning the AVR's echo when confirm is set."""
+        return await self._control("PWSTANDBY", timeout, confirm)
+
+    async def async_get_power_status(self, timeout: Optional[float] = None) -> Optional[str]:
         """Get power status (PWON or PWSTANDBY)."""
-        return await self._send_command("PW?", "PW")
+        return await self._query("PW?", "PW", deadline=_deadline(timeout))
 
-    async def async_mute_on(self) -> None:
-        """Mute the AVR."""
-        await self._send_command("MUON")
+    async def async_mute_on(
+        self, timeout: Optional[float] = None, confirm: bool = False
+    ) -> Optional[str]:
+        """Mute the AVR, returning the AVR's echo when confirm is set."""
+        return await self._control("MUON", timeout, confirm)
 
-    async def async_mute_off(self) -> None:
-        """Unmute the AVR."""
-        await self._send_command("MUOFF")
+    async def async_mute_off(
+        self, timeout: Optional[float] = None, confirm: bool = False
+    ) -> Optional[str]:
+        """Unmute the AVR, returning the AVR's echo when confirm is set."""
+        return await self._control("MUOFF", timeout, confirm)
 
-    async def async_get_mute_status(self) -> Optional[str]:
+    async def async_get_mute_status(self, timeout: Optional[float] = None) -> Optional[str]:
         """Get mute status (MUON or MUOFF)."""
-        return await self._send_command("MU?", "MU")
+        return await self._query("MU?", "MU", deadline=_deadline(timeout))
 
-    async def async_volume_up(self) -> None:
-        """Increase volume."""
-        await self._send_command("MVUP")
+    async def async_volume_up(
+        self, timeout: Optional[float] = None, confirm: bool = False
+    ) -> Optional[str]:
+        """Increase volume, returning the AVR's echo when confirm is set."""
+        return await self._control("MVUP", timeout, confirm)
 
-    async def async_volume_down(self) -> None:
-        """Decrease volume."""
-        await self._send_command("MVDOWN")
+    async def async_volume_down(
+        self, timeout: Optional[float] = None, confirm: bool = False
+    ) -> Optional[str]:
+        """Decrease volume, returning the AVR's echo when confirm is set."""
+        return await self._control("MVDOWN", timeout, confirm)
 
-    async def async_set_volume(self, level: int) -> None:
-        """Set volume level (0-98)."""
+    async def async_set_volume(
+        self, level: int, timeout: Optional[float] = None, confirm: bool = False
+    ) -> Optional[str]:
+        """Set volume level (0-98), returning the AVR's echo when confirm is set."""
         if not 0 <= level <= 98:
             raise ValueError("Volume level must be between 0 and 98")
-        await self._send_command(f"MV{level:02d}")
+        return await self._control(f"MV{level:02d}", timeout, confirm)
 
-    async def async_get_volume(self) -> Optional[str]:
+    async def async_get_volume(self, timeout: Optional[float] = None) -> Optional[str]:
         """Get current volume level."""
-        return await self._send_command("MV?", "MV")
+        return await self._query("MV?", "MV", deadline=_deadline(timeout))
 
-    async def async_select_input(self, input_code: str) -> None:
-        """Select input (e.g., 'VCR', 'TV', 'DVD')."""
-        await self._send_command(f"SI{input_code}")
+    async def async_select_input(
+        self, input_code: str, timeout: Optional[float] = None, confirm: bool = False
+    ) -> Optional[str]:
+        """Select input (e.g., 'VCR', 'TV', 'DVD'), returning the AVR's echo when confirm is set."""
+        return await self._control(f"SI{input_code}", timeout, confirm)
 
-    async def async_get_input(self) -> Optional[str]:
+    async def async_get_input(self, timeout: Optional[float] = None) -> Optional[str]:
         """Get current input."""
-        return await self._send_command("SI?", "SI")
+        return await self._query("SI?", "SI", deadline=_deadline(timeout))
 
-    async def _drain_input(self) -> None:
-        """Drain any pending input from the connection."""
-        if not self._reader:
-            return
-        try:
-            # Try to read any pending data with a very short timeout
-            # Use read(1) instead of readuntil to avoid conflicts
-            while True:
-                data = await asyncio.wait_for(
-                    self._reader.read(1), timeout=0.01
-                )
-                if not data:
-                    break  # No more data
-                # Continue reading until no more data
-        except asyncio.TimeoutError:
-            # No more data to drain
-            pass
-        except Exception as e:
-            _LOGGER.debug("Error draining input: %s", e)
+    async def async_send_command(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+        priority: Optional[int] = None,
+    ) -> None:
+        """Send a raw protocol command (e.g. "MSSTEREO") without waiting for a reply.
+
+        Replies and status changes it causes reach the listeners. Queries
+        ("...?") are scheduled as background traffic, anything else as
+        interactive, unless a priority is given.
+        """
+        if priority is None:
+            priority = PRIORITY_BACKGROUND if command.endswith("?") else PRIORITY_INTERACTIVE
+        await self._send_command(command, priority=priority, deadline=_deadline(timeout))
 
-    async def async_get_all_status(self) -> Dict[str, Any]:
+    async def async_get_all_status(self, timeout: Optional[float] = None) -> Dict[str, Any]:
         """Get all status information at once (for debugging)."""
-        status = {}
-        queries = [
-            ("power", "PW?", "PW"),
-            ("volume", "MV?", "MV"),
-            ("mute", "MU?", "MU"),
-            ("input", "SI?", "SI"),
-        ]
-
-        for name, command, expected_prefix in queries:
-            try:
-                response = await self._send_command(command, expected_prefix)
-                status[name] = response
-                _LOGGER.debug("Query %s (%s) returned: %s", name, command, response)
-            except Exception as e:
-                _LOGGER.debug("Query %s (%s) failed: %s", name, command, e)
-                status[name] = None
+        try:
+            status = await self.async_query_many(STATUS_QUERIES, timeout)
+        except Exception as e:
+            _LOGGER.debug("Status queries failed: %s", e)
+            return {name: None for name, _, _ in STATUS_QUERIES}
 
+        _LOGGER.debug("Status queries returned: %s", status)
         return status
 
-    async def async_get_volume_alt(self) -> Optional[str]:
+    async def async_get_volume_alt(self, timeout: Optional[float] = None) -> Optional[str]:
         """Try alternative volume query methods."""
         # Try MV? again as fallback (CV? was returning power status)
-        return await self._send_command("MV?", "MV")
+        return await self._query("MV?", "MV", deadline=_deadline(timeout))
 
-    async def async_get_power_alt(self) -> Optional[str]:
+    async def async_get_power_alt(self, timeout: Optional[float] = None) -> Optional[str]:
         """Try alternative power query methods."""
+        deadline = _deadline(timeout)
         # Try PW? first
-        response = await self._send_command("PW?", "PW")
+        response = await self._query("PW?", "PW", deadline=deadline)
         if response:
             return response
         # Some AVRs use ZM? for main zone power
-        return await self._send_command("ZM?", "ZM")
+        return await self._query("ZM?", "ZM", deadline=deadline)
 
     def get_diagnostics(self) -> Dict[str, Any]:
         """Get diagnostic information for troubleshooting."""
@@ -352,13 +1284,22 @@ class DenonAvr3805ApiClient:
                 "host": self._host,
                 "port": self._port,
                 "is_connected": self.is_connected,
+                "persistent": self.is_persistent,
+                "idle_seconds": round(time.monotonic() - self._last_activity, 1),
             },
             "config": self._config,
+            "scheduler": self._scheduler.get_diagnostics(),
+            "pacing": self._pacer.get_diagnostics(),
+            "throttle": self._throttle.get_diagnostics(),
+            "breaker": self._breaker.get_diagnostics(),
             "stats": {
                 "successful_connections": self._stats.successful_connections,
                 "failed_connections": self._stats.failed_connections,
                 "total_commands": self._stats.total_commands,
                 "failed_commands": self._stats.failed_commands,
+                "coalesced_commands": self._stats.coalesced_commands,
+                "cache_hits": self._stats.cache_hits,
+                "shared_queries": self._stats.shared_queries,
                 "consecutive_failures": self._stats.consecutive_failures,
                 "success_rate": self._stats.success_rate,
                 "is_healthy": self._stats.is_healthy,
@@ -368,3 +1309,57 @@ class DenonAvr3805ApiClient:
         }
 
     # Add more methods as needed for other AVR functions
+
+
+class TransportRegistry:
+    """Hand out one shared client per ser2net endpoint.
+
+    ser2net usually accepts a single TCP client per serial port, so every
+    user of the same (host, port) - config entries, the config and options
+    flow connection tests - goes through one client and its one connection.
+    The client's scheduler serializes their commands, queries are matched
+    to their replies by the router and pushed lines reach every listener.
+    The client is closed when its last user releases it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._clients: Dict[Tuple[str, int], DenonAvr3805ApiClient] = {}
+        self._users: Dict[Tuple[str, int], int] = {}
+
+    def acquire(
+        self, host: str, port: int, config: Optional[Dict[str, Any]] = None
+    ) -> DenonAvr3805ApiClient:
+        """Return the client for an endpoint, creating it on first use.
+
+        ``config`` only applies when the client is created; later users share
+        the existing client as it is.
+        """
+        key = (host, port)
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = DenonAvr3805ApiClient(host, port, config)
+            self._users[key] = 0
+        self._users[key] += 1
+        return client
+
+    def get(self, host: str, port: int) -> Optional[DenonAvr3805ApiClient]:
+        """Return the live client for an endpoint, if there is one."""
+        return self._clients.get((host, port))
+
+    async def async_release(self, client: DenonAvr3805ApiClient) -> None:
+        """Give up one use of a client, closing it when nobody uses it anymore."""
+        key = client.endpoint
+        if self._clients.get(key) is not client:
+            await client.async_close()
+            return
+
+        self._users[key] -= 1
+        if self._users[key] <= 0:
+            del self._clients[key]
+            del self._users[key]
+            await client.async_close()
+
+
+# Process-wide registry, so every user of a ser2net port shares one connection
+TRANSPORTS = TransportRegistry()
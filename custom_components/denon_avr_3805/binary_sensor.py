@@ -8,6 +8,7 @@ from .const import DEFAULT_NAME
 from .const import DOMAIN
 from .const import NAME
 from .entity import DenonAvr3805Entity
+from .state import FIELDS
 
 
 async def async_setup_entry(hass, entry, async_add_devices):
@@ -19,6 +20,18 @@ async def async_setup_entry(hass, entry, async_add_devices):
 class DenonAvr3805BinarySensor(DenonAvr3805Entity, BinarySensorEntity):
     """denon_avr_3805 binary_sensor class."""
 
+    # Connectivity follows availability, the attributes show the raw status fields
+    _fields = FIELDS
+
+    # Link counters move with every command. They are refreshed whenever the
+    # state is written anyway but kept out of the recorder, diagnostics have
+    # the current values.
+    _unrecorded_attributes = frozenset({
+        "success_rate",
+        "consecutive_failures",
+        "total_commands",
+    })
+
     @property
     def unique_id(self):
         """Return a unique ID for this entity."""
@@ -41,17 +54,8 @@ class DenonAvr3805BinarySensor(DenonAvr3805Entity, BinarySensorEntity):
         if not self.coordinator.last_update_success:
             return False
 
-        # Check if we have valid data indicating AVR is actually responding
-        if self.coordinator.data:
-            # At least one valid response indicates connection is working
-            valid_responses = any(
-                value is not None
-                for key, value in self.coordinator.data.items()
-                if key in ['power', 'volume', 'mute', 'input']
-            )
-            return valid_responses
-
-        return False
+        # At least one valid response indicates connection is working
+        return self.coordinator.data is not None and self.coordinator.data.has_status
 
     @property
     def extra_state_attributes(self):
@@ -62,6 +66,7 @@ class DenonAvr3805BinarySensor(DenonAvr3805Entity, BinarySensorEntity):
         stats = self.coordinator.api.connection_stats
         attributes = {
             "tcp_connected": self.coordinator.api.is_connected,
+            "circuit_breaker": self.coordinator.api.breaker_state,
             "last_update_success": self.coordinator.last_update_success,
             "success_rate": round(stats.success_rate * 100, 1),
             "consecutive_failures": stats.consecutive_failures,
@@ -75,6 +80,7 @@ class DenonAvr3805BinarySensor(DenonAvr3805Entity, BinarySensorEntity):
                 "volume_status": self.coordinator.data.get("volume"),
                 "mute_status": self.coordinator.data.get("mute"),
                 "input_status": self.coordinator.data.get("input"),
+                "surround_status": self.coordinator.data.get("surround"),
             })
 
         return attributes
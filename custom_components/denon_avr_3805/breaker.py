@@ -0,0 +1,106 @@
+"""Circuit breaker for connections to the Denon AVR-3805."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+# Circuit breaker states
+BREAKER_CLOSED = "closed"        # Calls go through
+BREAKER_OPEN = "open"            # Calls are rejected until the reset timeout passes
+BREAKER_HALF_OPEN = "half_open"  # One probe is let through to test the link
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when a call is rejected because the AVR is known to be unreachable."""
+
+
+class CircuitBreaker:
+    """Fail fast while the AVR or ser2net is unreachable.
+
+    After ``failure_threshold`` consecutive failed connections the breaker
+    opens and callers are rejected without touching the network. Once the
+    reset timeout has passed it is half-open and lets a single probe through:
+    success closes it, failure opens it again with the timeout doubled, up to
+    ``max_reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 2,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 300.0,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self._failure_threshold = failure_threshold
+        self._base_reset_timeout = reset_timeout
+        self._max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.trips = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Return the breaker state."""
+        if self._opened_at is None:
+            return BREAKER_CLOSED
+        if self._probing or self.retry_in == 0:
+            return BREAKER_HALF_OPEN
+        return BREAKER_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed, 0 if calls may go through."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return True if a call may go through, claiming the probe when half-open."""
+        state = self.state
+        if state == BREAKER_CLOSED:
+            return True
+        if state == BREAKER_HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        if self._opened_at is not None:
+            _LOGGER.info("AVR reachable again, closing circuit breaker")
+        self.failures = 0
+        self.reset_timeout = self._base_reset_timeout
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker when the threshold is reached."""
+        self.failures += 1
+        if self._probing:
+            # The probe failed, wait longer before the next one
+            self.reset_timeout = min(self.reset_timeout * 2, self._max_reset_timeout)
+            self._probing = False
+            self._opened_at = time.monotonic()
+            _LOGGER.debug("Probe failed, next one in %.0fs", self.reset_timeout)
+        elif self._opened_at is None and self.failures >= self._failure_threshold:
+            self.trips += 1
+            self._opened_at = time.monotonic()
+            _LOGGER.warning(
+                "AVR unreachable after %d attempts, failing fast for %.0fs",
+                self.failures, self.reset_timeout,
+            )
+
+    def get_diagnostics(self) -> Dict[str, Any]:
+        """Get the breaker state and counters."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "reset_timeout": self.reset_timeout,
+            "retry_in": round(self.retry_in, 1),
+        }
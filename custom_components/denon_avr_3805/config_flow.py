@@ -4,14 +4,45 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 
 from .api import DenonAvr3805ApiClient
+from .api import TRANSPORTS
 from .const import CONF_HOST
 from .const import CONF_NAME
 from .const import CONF_PORT
 from .const import CONF_MODEL
+from .const import CONF_PROXY_HOST
+from .const import CONF_PROXY_PORT
 from .const import DEFAULT_MODEL
+from .const import DEFAULT_PROXY_HOST
+from .const import DEFAULT_PROXY_PORT
 from .const import DOMAIN
 from .const import PLATFORMS
 
+# Upper bound for the connection test, whether it reuses a live link or connects
+CONNECTION_TEST_TIMEOUT = 15.0
+
+
+async def _async_test_connection(host, port):
+    """Return True if the AVR answers a power query.
+
+    Goes through the shared client of a running entry for the same ser2net
+    port while it is connected, instead of competing with it for the port.
+    Otherwise a fresh client is used, so the breaker of a shared client that
+    could not reach the AVR earlier does not fail the test without trying.
+    """
+    shared = TRANSPORTS.get(host, port)
+    if shared is not None and shared.is_connected:
+        client = TRANSPORTS.acquire(host, port)
+    else:
+        client = DenonAvr3805ApiClient(host, port)
+    try:
+        async with client.session(timeout=CONNECTION_TEST_TIMEOUT):
+            status = await client.async_get_power_status(timeout=CONNECTION_TEST_TIMEOUT)
+        return status is not None
+    except Exception:  # pylint: disable=broad-except
+        return False
+    finally:
+        await TRANSPORTS.async_release(client)
+
 
 class DenonAvr3805FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     """Config flow for denon_avr_3805."""
@@ -67,16 +98,7 @@ class DenonAvr3805FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def _test_connection(self, host, port):
         """Return true if connection to AVR is successful."""
-        try:
-            client = DenonAvr3805ApiClient(host, port)
-            await client.connect()
-            # Test with a status query
-            status = await client.async_get_power_status()
-            await client.disconnect()
-            return status is not None
-        except Exception:  # pylint: disable=broad-except
-            pass
-        return False
+        return await _async_test_connection(host, port)
 
 
 class DenonAvr3805OptionsFlowHandler(config_entries.OptionsFlow):
@@ -91,7 +113,7 @@ class DenonAvr3805OptionsFlowHandler(config_entries.OptionsFlow):
         """Manage the options."""
         return self.async_show_menu(
             step_id="init",
-            menu_options=["connection", "platforms"]
+            menu_options=["connection", "platforms", "proxy"]
         )
 
     async def async_step_connection(self, user_input=None):
@@ -138,6 +160,29 @@ class DenonAvr3805OptionsFlowHandler(config_entries.OptionsFlow):
             ),
         )
 
+    async def async_step_proxy(self, user_input=None):
+        """Handle sharing proxy configuration."""
+        if user_input is not None:
+            self.options.update(user_input)
+            return await self._update_options()
+
+        return self.async_show_form(
+            step_id="proxy",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_PROXY_PORT,
+                        default=self.options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT)
+                    ): vol.All(int, vol.Range(min=0, max=65535)),
+                    # Binding beyond loopback lets anyone on the network control the AVR
+                    vol.Required(
+                        CONF_PROXY_HOST,
+                        default=self.options.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST)
+                    ): str,
+                }
+            ),
+        )
+
     def _get_connection_schema(self, user_input=None):
         """Get connection configuration schema with current values."""
         current_data = self.config_entry.data
@@ -165,14 +210,7 @@ class DenonAvr3805OptionsFlowHandler(config_entries.OptionsFlow):
 
     async def _test_connection(self, host, port):
         """Test connection to AVR."""
-        try:
-            client = DenonAvr3805ApiClient(host, port)
-            await client.connect()
-            status = await client.async_get_power_status()
-            await client.disconnect()
-            return status is not None
-        except Exception:
-            return False
+        return await _async_test_connection(host, port)
 
     async def async_step_user(self, user_input=None):
         """Handle legacy options flow."""
@@ -1,4 +1,6 @@
 """Constants for Denon AVR-3805."""
+from datetime import timedelta
+
 # Base component constants
 NAME = "Denon AVR-3805"
 DOMAIN = "denon_avr_3805"
@@ -29,10 +31,41 @@ CONF_HOST = "host"
 CONF_NAME = "name"
 CONF_PORT = "port"
 CONF_MODEL = "model"
+CONF_PROXY_PORT = "proxy_port"
+CONF_PROXY_HOST = "proxy_host"
 
 # Defaults
 DEFAULT_NAME = DOMAIN
 DEFAULT_MODEL = "AVR-3805"
+DEFAULT_PROXY_PORT = 0  # Fan-out proxy disabled
+DEFAULT_PROXY_HOST = "127.0.0.1"  # Only local tools, proxy clients are not authenticated
+
+# How often each status field is polled. Fields that are due in the same
+# cycle are sent as one batch; pushed updates reset a field's timer.
+DEFAULT_POLL_PLAN = {
+    "power": timedelta(seconds=30),
+    "volume": timedelta(minutes=2),
+    "mute": timedelta(minutes=2),
+    "input": timedelta(minutes=5),
+    "surround": timedelta(minutes=10),
+}
+
+# The poll plan above is scaled with activity: right after a change the
+# shortest interval drops to MIN_POLL_INTERVAL, and it doubles with every
+# quiet poll up to MAX_POLL_INTERVAL.
+MIN_POLL_INTERVAL = timedelta(seconds=2)
+MAX_POLL_INTERVAL = timedelta(minutes=1)
+
+# In standby the AVR only answers power queries, so only power is polled
+STANDBY_POLL_INTERVAL = timedelta(minutes=2)
+
+# Field refreshes requested within this many seconds are merged into one batch
+FIELD_REFRESH_COOLDOWN = 0.3
+
+# Overall seconds a command and its confirmation, or a whole scene, may take,
+# from connecting through waiting for the link to the AVR's answers
+COMMAND_TIMEOUT = 15.0
+SCENE_TIMEOUT = 30.0
 
 
 STARTUP_MESSAGE = f"""
@@ -1,6 +1,7 @@
 """DenonAvr3805Entity class"""
 from __future__ import annotations
 
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import ATTRIBUTION
@@ -16,10 +17,23 @@ from .const import NAME
 class DenonAvr3805Entity(CoordinatorEntity):
     _attr_has_entity_name = True
 
+    # Coordinator fields the state is derived from, None to write on every update
+    _fields: tuple[str, ...] | None = None
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator)
         self.config_entry = config_entry
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when availability or one of our fields changed."""
+        if (
+            self._fields is None
+            or self.coordinator.availability_changed
+            or not self.coordinator.changed_fields.isdisjoint(self._fields)
+        ):
+            self.async_write_ha_state()
+
     @property
     def device_info(self):
         """Return device information."""
@@ -1,14 +1,41 @@
 """Media player platform for Denon AVR-3805."""
+from functools import partial
+
+import voluptuous as vol
 from homeassistant.components.media_player import MediaPlayerEntity
 from homeassistant.components.media_player import MediaPlayerEntityFeature
 from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_platform
 
 from .const import CONF_NAME
 from .const import DEFAULT_NAME
 from .const import DOMAIN
 from .const import MEDIA_PLAYER
 from .const import NAME
+from .const import SCENE_TIMEOUT
 from .entity import DenonAvr3805Entity
+from .protocol import SOURCES
+from .protocol import VOLUME_MAX
+from .protocol import VOLUME_MIN
+from .state import FIELDS
+
+SERVICE_APPLY_SCENE = "apply_scene"
+ATTR_STEPS = "steps"
+ATTR_TIMEOUT = "timeout"
+
+# One step of a scene, applied in the order the fields are given
+SCENE_STEP_SCHEMA = vol.Schema(
+    {
+        vol.Optional("power"): cv.boolean,
+        vol.Optional("input"): vol.In(SOURCES),
+        vol.Optional("volume"): vol.All(
+            vol.Coerce(float), vol.Range(min=VOLUME_MIN, max=VOLUME_MAX)
+        ),
+        vol.Optional("mute"): cv.boolean,
+        vol.Optional("surround"): cv.string,
+    }
+)
 
 
 async def async_setup_entry(hass, entry, async_add_devices):
@@ -16,10 +43,24 @@ async def async_setup_entry(hass, entry, async_add_devices):
     coordinator = hass.data[DOMAIN][entry.entry_id]
     async_add_devices([DenonAvr3805MediaPlayer(coordinator, entry)])
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_APPLY_SCENE,
+        {
+            vol.Required(ATTR_STEPS): vol.All(cv.ensure_list, [SCENE_STEP_SCHEMA]),
+            vol.Optional(ATTR_TIMEOUT, default=SCENE_TIMEOUT): vol.All(
+                vol.Coerce(float), vol.Range(min=1, max=300)
+            ),
+        },
+        "async_apply_scene",
+    )
+
 
 class DenonAvr3805MediaPlayer(DenonAvr3805Entity, MediaPlayerEntity):
     """Denon AVR-3805 media player class."""
 
+    _fields = FIELDS
+
     @property
     def unique_id(self):
         """Return a unique ID for this entity."""
@@ -43,11 +84,7 @@ class DenonAvr3805MediaPlayer(DenonAvr3805Entity, MediaPlayerEntity):
     @property
     def state(self):
         """Return the state of the media player."""
-        power_status = self.coordinator.data.get("power")
-        if power_status and isinstance(power_status, str):
-            if power_status in ["PWON", "ON", "ZM ON"]:
-                return STATE_ON
-        return STATE_OFF
+        return STATE_ON if self.coordinator.data.power else STATE_OFF
 
     @property
     def supported_features(self):
@@ -64,92 +101,83 @@ class DenonAvr3805MediaPlayer(DenonAvr3805Entity, MediaPlayerEntity):
     @property
     def volume_level(self):
         """Volume level of the media player (0..1)."""
-        volume_response = self.coordinator.data.get("volume")
-        if volume_response and isinstance(volume_response, str):
-            # Handle different volume response formats
-            if volume_response.startswith("MV"):
-                try:
-                    vol_str = volume_response[2:]
-                    if vol_str.isdigit():
-                        level = int(vol_str)
-                        return level / 98.0  # Denon uses 0-98 scale
-                except (ValueError, IndexError):
-                    pass
-            elif volume_response.isdigit():
-                try:
-                    level = int(volume_response)
-                    return level / 98.0
-                except ValueError:
-                    pass
-        return None
+        volume = self.coordinator.data.volume
+        if volume is None:
+            return None
+        return volume / VOLUME_MAX  # Denon uses 0-98 scale
 
     @property
     def is_volume_muted(self):
         """Boolean if volume is currently muted."""
-        mute_status = self.coordinator.data.get("mute")
-        if mute_status and isinstance(mute_status, str):
-            return mute_status in ["MUON", "ON"]
-        return False
+        return bool(self.coordinator.data.muted)
 
     @property
     def source(self):
         """Return the current input source."""
-        input_response = self.coordinator.data.get("input")
-        if input_response and isinstance(input_response, str):
-            if input_response.startswith("SI"):
-                source = input_response[2:]
-                return source if source else None
-            elif len(input_response) > 0:
-                if input_response in ["ON", "OFF", "STANDBY", "PWON", "PWSTANDBY"]:
-                    return None
-                return input_response
-        return None
+        return self.coordinator.data.source
+
+    @property
+    def sound_mode(self):
+        """Return the current surround mode."""
+        return self.coordinator.data.surround
 
     @property
     def source_list(self):
         """List of available input sources."""
-        return [
-            "VCR", "DVD", "TV", "CD", "TUNER", "AUX", "NET", "USB",
-            "PHONO", "DVR", "CBL/SAT", "V.AUX", "DOCK", "IPOD",
-            "BD", "HDRADIO", "SIRIUS", "GAME", "GAME2", "VAUX",
-            "DOCK", "IPD", "IRP", "FVP"
-        ]
+        return list(SOURCES)
 
     async def async_turn_on(self):
         """Turn the media player on."""
-        await self.coordinator.api.connect()
-        await self.coordinator.api.async_power_on()
-        await self.coordinator.api.disconnect()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_execute_and_refresh_field(
+            self.coordinator.api.async_power_on,
+            "power",
+            self.coordinator.api.async_get_power_status,
+            expected="PWON",
+        )
 
     async def async_turn_off(self):
         """Turn the media player off."""
-        await self.coordinator.api.connect()
-        await self.coordinator.api.async_power_off()
-        await self.coordinator.api.disconnect()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_execute_and_refresh_field(
+            self.coordinator.api.async_power_off,
+            "power",
+            self.coordinator.api.async_get_power_status,
+            expected="PWSTANDBY",
+        )
 
     async def async_set_volume_level(self, volume):
         """Set volume level, range 0..1."""
-        level = int(volume * 98)  # Convert to 0-98 scale
-        await self.coordinator.api.connect()
-        await self.coordinator.api.async_set_volume(level)
-        await self.coordinator.api.disconnect()
-        await self.coordinator.async_request_refresh()
+        level = int(volume * VOLUME_MAX)  # Convert to 0-98 scale
+        await self.coordinator.async_execute_and_refresh_field(
+            partial(self.coordinator.api.async_set_volume, level),
+            "volume",
+            self.coordinator.api.async_get_volume,
+            expected=f"MV{level:02d}",
+        )
 
     async def async_volume_up(self):
         """Volume up the media player."""
-        await self.coordinator.api.connect()
-        await self.coordinator.api.async_volume_up()
-        await self.coordinator.api.disconnect()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_execute_and_refresh_field(
+            self.coordinator.api.async_volume_up,
+            "volume",
+            self.coordinator.api.async_get_volume,
+            expected=self._stepped_volume(1),
+        )
 
     async def async_volume_down(self):
         """Volume down the media player."""
-        await self.coordinator.api.connect()
-        await self.coordinator.api.async_volume_down()
-        await self.coordinator.api.disconnect()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_execute_and_refresh_field(
+            self.coordinator.api.async_volume_down,
+            "volume",
+            self.coordinator.api.async_get_volume,
+            expected=self._stepped_volume(-1),
+        )
+
+    def _stepped_volume(self, step):
+        """Return the volume line a step leads to, or None if the volume is unknown."""
+        volume = self.coordinator.data.volume
+        if volume is None:
+            return None
+        return f"MV{min(max(int(volume) + step, VOLUME_MIN), VOLUME_MAX):02d}"
 
     async def async_mute_volume(self, mute):
         """Mute the volume."""
@@ -162,11 +190,21 @@ class DenonAvr3805MediaPlayer(DenonAvr3805Entity, MediaPlayerEntity):
             command,
             "mute",
             self.coordinator.api.async_get_mute_status,
+            expected="MUON" if mute else "MUOFF",
+        )
+
+    async def async_apply_scene(self, steps, timeout=SCENE_TIMEOUT):
+        """Bring the AVR to the states of a scene, in order, within timeout seconds."""
+        await self.coordinator.async_apply_scene(
+            [(field, value) for step in steps for field, value in step.items()],
+            timeout=timeout,
         )
 
     async def async_select_source(self, source):
         """Select input source."""
-        await self.coordinator.api.connect()
-        await self.coordinator.api.async_select_input(source)
-        await self.coordinator.api.disconnect()
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
+        await self.coordinator.async_execute_and_refresh_field(
+            partial(self.coordinator.api.async_select_input, source),
+            "input",
+            self.coordinator.api.async_get_input,
+            expected=f"SI{source}",
+        )
\ No newline at end of file
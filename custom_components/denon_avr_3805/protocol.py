@@ -0,0 +1,264 @@
+"""Denon AVR-3805 serial protocol: parse status lines and encode commands.
+
+Every line the AVR sends starts with a two-letter command group (PW, MV, MU,
+SI, ...). Parsing looks that group up in a precompiled table and builds a
+small event object, so a line is decoded once no matter how many consumers
+look at it. Outgoing commands are encoded from a table built at import time.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, Optional
+
+# Volume scale used by the AVR-3805, in whole steps
+VOLUME_MIN = 0
+VOLUME_MAX = 98
+
+# Input sources that can be selected with SI<source>
+SOURCES = (
+    "VCR", "DVD", "TV", "CD", "TUNER", "AUX", "NET", "USB",
+    "PHONO", "DVR", "CBL/SAT", "V.AUX", "DOCK", "IPOD",
+    "BD", "HDRADIO", "SIRIUS", "GAME", "GAME2", "VAUX",
+    "IPD", "IRP", "FVP",
+)
+
+
+class Event:
+    """A line received from the AVR that is not one of the known status types."""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: str) -> None:
+        """Initialize with the decoded line."""
+        self.raw = raw
+
+    def __repr__(self) -> str:
+        """Return a readable representation for logging."""
+        return f"{type(self).__name__}({self.raw!r})"
+
+    def __eq__(self, other: object) -> bool:
+        """Events are equal when they are the same type with the same line."""
+        return type(other) is type(self) and other.raw == self.raw
+
+    def __hash__(self) -> int:
+        """Hash consistently with equality."""
+        return hash((type(self), self.raw))
+
+
+class Power(Event):
+    """Main power state (PWON / PWSTANDBY)."""
+
+    __slots__ = ("on",)
+
+    def __init__(self, raw: str, on: bool) -> None:
+        """Initialize."""
+        super().__init__(raw)
+        self.on = on
+
+
+class MasterVolume(Event):
+    """Master volume on the 0-98 scale, 50.5 for the half-step form MV505."""
+
+    __slots__ = ("level",)
+
+    def __init__(self, raw: str, level: float) -> None:
+        """Initialize."""
+        super().__init__(raw)
+        self.level = level
+
+
+class Mute(Event):
+    """Mute state (MUON / MUOFF)."""
+
+    __slots__ = ("muted",)
+
+    def __init__(self, raw: str, muted: bool) -> None:
+        """Initialize."""
+        super().__init__(raw)
+        self.muted = muted
+
+
+class Source(Event):
+    """Selected input source (SIDVD, SICD, ...)."""
+
+    __slots__ = ("source",)
+
+    def __init__(self, raw: str, source: str) -> None:
+        """Initialize."""
+        super().__init__(raw)
+        self.source = source
+
+
+class Zone(Event):
+    """Zone status: main zone power (ZMON) or a zone 2/3 line (Z2ON, Z2DVD, Z250)."""
+
+    __slots__ = ("zone", "value")
+
+    def __init__(self, raw: str, zone: str, value: str) -> None:
+        """Initialize."""
+        super().__init__(raw)
+        self.zone = zone
+        self.value = value
+
+    @property
+    def on(self) -> Optional[bool]:
+        """Return the zone power state, or None if the line is not about power."""
+        return _ON_OFF.get(self.value)
+
+
+class SurroundMode(Event):
+    """Surround mode (MSSTEREO, MSDOLBY DIGITAL, ...)."""
+
+    __slots__ = ("mode",)
+
+    def __init__(self, raw: str, mode: str) -> None:
+        """Initialize."""
+        super().__init__(raw)
+        self.mode = mode
+
+
+_ON_OFF = {"ON": True, "OFF": False}
+_POWER_VALUES = {b"ON": True, b"STANDBY": False, b"OFF": False}
+_MUTE_VALUES = {b"ON": True, b"OFF": False}
+
+
+def _parse_power(raw: str, value: bytes) -> Optional[Event]:
+    on = _POWER_VALUES.get(value)
+    return None if on is None else Power(raw, on)
+
+
+def _parse_volume(raw: str, value: bytes) -> Optional[Event]:
+    # MV45 is a whole step, MV455 the half step above it
+    if not value.isdigit() or len(value) not in (2, 3):
+        return None
+    level = int(value[:2])
+    if len(value) == 3:
+        if value[2:] != b"5":
+            return None
+        level += 0.5
+    if level > VOLUME_MAX:
+        return None
+    return MasterVolume(raw, float(level))
+
+
+def _parse_mute(raw: str, value: bytes) -> Optional[Event]:
+    muted = _MUTE_VALUES.get(value)
+    return None if muted is None else Mute(raw, muted)
+
+
+def _parse_source(raw: str, value: bytes) -> Optional[Event]:
+    if not value or value == b"?":
+        return None
+    return Source(raw, value.decode("ascii", errors="replace"))
+
+
+def _parse_main_zone(raw: str, value: bytes) -> Optional[Event]:
+    # Some firmware answers "ZM ON" with a space
+    value = value.strip()
+    if value not in (b"ON", b"OFF"):
+        return None
+    return Zone(raw, "main", value.decode("ascii"))
+
+
+def _zone_parser(zone: str) -> Callable[[str, bytes], Optional[Event]]:
+    def parse(raw: str, value: bytes) -> Optional[Event]:
+        if not value or value == b"?":
+            return None
+        return Zone(raw, zone, value.decode("ascii", errors="replace"))
+
+    return parse
+
+
+def _parse_surround(raw: str, value: bytes) -> Optional[Event]:
+    if not value or value == b"?":
+        return None
+    return SurroundMode(raw, value.decode("ascii", errors="replace"))
+
+
+# Command group -> parser for the value that follows it
+_PARSERS: Dict[bytes, Callable[[str, bytes], Optional[Event]]] = {
+    b"PW": _parse_power,
+    b"MV": _parse_volume,
+    b"MU": _parse_mute,
+    b"SI": _parse_source,
+    b"ZM": _parse_main_zone,
+    b"Z2": _zone_parser("2"),
+    b"Z3": _zone_parser("3"),
+    b"MS": _parse_surround,
+}
+
+
+def parse(line: bytes) -> Optional[Event]:
+    """Parse one raw line from the AVR, with or without its trailing CR.
+
+    Returns None for an empty line and a plain Event for lines that are not
+    one of the known status types (e.g. "MVMAX 98").
+    """
+    line = line.strip()
+    if not line:
+        return None
+    raw = line.decode("ascii", errors="replace")
+    parser = _PARSERS.get(line[:2])
+    if parser is not None:
+        event = parser(raw, line[2:])
+        if event is not None:
+            return event
+    return Event(raw)
+
+
+def parse_text(text: Optional[str]) -> Optional[Event]:
+    """Parse a line that has already been decoded, e.g. a stored status value."""
+    if not text:
+        return None
+    return parse(text.encode("ascii", errors="replace"))
+
+
+# Fixed commands, encoded once
+POWER_ON = b"PWON\r"
+POWER_STANDBY = b"PWSTANDBY\r"
+MUTE_ON = b"MUON\r"
+MUTE_OFF = b"MUOFF\r"
+VOLUME_UP = b"MVUP\r"
+VOLUME_DOWN = b"MVDOWN\r"
+
+QUERY_POWER = b"PW?\r"
+QUERY_VOLUME = b"MV?\r"
+QUERY_MUTE = b"MU?\r"
+QUERY_SOURCE = b"SI?\r"
+QUERY_MAIN_ZONE = b"ZM?\r"
+QUERY_SURROUND = b"MS?\r"
+
+_VOLUME_COMMANDS = tuple(b"MV%02d\r" % level for level in range(VOLUME_MIN, VOLUME_MAX + 1))
+_HALF_STEP_COMMANDS = tuple(b"MV%02d5\r" % level for level in range(VOLUME_MIN, VOLUME_MAX))
+
+_COMMANDS: Dict[str, bytes] = {
+    command.decode("ascii").rstrip("\r"): command
+    for command in (
+        POWER_ON, POWER_STANDBY, MUTE_ON, MUTE_OFF, VOLUME_UP, VOLUME_DOWN,
+        QUERY_POWER, QUERY_VOLUME, QUERY_MUTE, QUERY_SOURCE, QUERY_MAIN_ZONE,
+        QUERY_SURROUND, *_VOLUME_COMMANDS, *_HALF_STEP_COMMANDS,
+        *(f"SI{source}\r".encode("ascii") for source in SOURCES),
+    )
+}
+
+
+def encode_volume(level: float) -> bytes:
+    """Encode an absolute master volume, rounded to the nearest half step."""
+    if not VOLUME_MIN <= level <= VOLUME_MAX:
+        raise ValueError(f"Volume level must be between {VOLUME_MIN} and {VOLUME_MAX}")
+    half_steps = round(level * 2)
+    if half_steps % 2:
+        return _HALF_STEP_COMMANDS[half_steps // 2]
+    return _VOLUME_COMMANDS[half_steps // 2]
+
+
+def encode_source(source: str) -> bytes:
+    """Encode an input source selection."""
+    return encode(f"SI{source}")
+
+
+def encode(command: str) -> bytes:
+    """Encode any command string, using the precomputed bytes when there are some."""
+    encoded = _COMMANDS.get(command)
+    if encoded is None:
+        encoded = f"{command}\r".encode("ascii")
+    return encoded
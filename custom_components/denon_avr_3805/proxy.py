@@ -0,0 +1,167 @@
+"""Local TCP fan-out proxy that shares the AVR serial line with other tools."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import Callable, Optional, Set
+
+from .api import DenonAvr3805ApiClient
+from .protocol import Event
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+# Longest command accepted from a proxy client, no AVR-3805 command comes close
+MAX_COMMAND_LENGTH = 32
+
+# Output queued for a client that stops reading before it is disconnected
+MAX_WRITE_BUFFER = 64 * 1024
+
+_LINE_END = re.compile(rb"[\r\n]")
+
+
+class FanOutProxy:
+    """Let several TCP clients share the AVR through the integration's client.
+
+    Every connected client receives everything the AVR sends, replies to
+    Home Assistant's own polls included. Lines a client sends are forwarded
+    as commands through the API client, so they are queued and paced by its
+    command scheduler together with the integration's traffic instead of
+    competing for ser2net's single connection.
+    """
+
+    def __init__(
+        self,
+        client: DenonAvr3805ApiClient,
+        port: int,
+        host: str = "127.0.0.1",
+        max_clients: int = 8,
+    ) -> None:
+        """Initialize the proxy, call async_start() to accept connections.
+
+        Proxy clients are not authenticated and can control the AVR, so the
+        proxy only listens on the loopback interface unless another host
+        (e.g. "0.0.0.0") is given explicitly.
+        """
+        self._client = client
+        self._host = host
+        self._port = port
+        self._max_clients = max_clients
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._remove_listener: Optional[Callable[[], None]] = None
+        self.forwarded_commands = 0
+
+    @property
+    def host(self) -> str:
+        """Return the address the proxy listens on."""
+        return self._host
+
+    @property
+    def port(self) -> int:
+        """Return the port the proxy listens on."""
+        if self._server is not None and self._server.sockets:
+            return self._server.sockets[0].getsockname()[1]
+        return self._port
+
+    @property
+    def clients(self) -> int:
+        """Return the number of connected proxy clients."""
+        return len(self._writers)
+
+    async def async_start(self) -> None:
+        """Start listening and mirroring the AVR output."""
+        self._server = await asyncio.start_server(
+            self._handle_client, self._host, self._port
+        )
+        self._remove_listener = self._client.add_listener(
+            self._broadcast, include_replies=True
+        )
+        _LOGGER.info("Sharing the AVR on port %d", self.port)
+
+    async def async_stop(self) -> None:
+        """Disconnect every client and stop listening."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        self._writers.clear()
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    def _broadcast(self, event: Event) -> None:
+        """Send a line from the AVR to every connected client."""
+        data = f"{event.raw}\r".encode("ascii", errors="replace")
+        for writer in list(self._writers):
+            if writer.is_closing():
+                continue
+            if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                # Don't let a client that stopped reading pile up AVR output
+                _LOGGER.debug("Proxy client is not reading, disconnecting it")
+                self._writers.discard(writer)
+                writer.close()
+                continue
+            writer.write(data)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Forward the commands of one client until it disconnects."""
+        peer = writer.get_extra_info("peername")
+        if len(self._writers) >= self._max_clients:
+            _LOGGER.warning("Rejecting proxy client %s, %d already connected", peer, self._max_clients)
+            writer.close()
+            return
+
+        _LOGGER.debug("Proxy client connected: %s", peer)
+        self._writers.add(writer)
+        buffer = b""
+        try:
+            while True:
+                data = await reader.read(256)
+                if not data:
+                    break
+                # Accept CR (as the AVR uses), LF or CRLF line endings
+                *lines, buffer = _LINE_END.split(buffer + data)
+                if len(buffer) > MAX_COMMAND_LENGTH:
+                    _LOGGER.debug("Dropping oversized line from proxy client %s", peer)
+                    buffer = b""
+                for line in lines:
+                    await self._forward(line.strip())
+        except (ConnectionError, OSError) as e:
+            _LOGGER.debug("Proxy client %s failed: %s", peer, e)
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            _LOGGER.debug("Proxy client disconnected: %s", peer)
+
+    async def _forward(self, line: bytes) -> None:
+        """Send one command from a proxy client to the AVR."""
+        if not line or len(line) > MAX_COMMAND_LENGTH:
+            return
+        try:
+            command = line.decode("ascii")
+        except UnicodeDecodeError:
+            _LOGGER.debug("Ignoring non-ASCII line from proxy client: %r", line)
+            return
+        if not command.isprintable():
+            return
+
+        try:
+            await self._client.async_send_command(command)
+            self.forwarded_commands += 1
+        except Exception as e:  # pylint: disable=broad-except
+            # The client keeps its connection, the command is just lost like on a busy line
+            _LOGGER.debug("Could not forward %s from proxy client: %s", command, e)
+
+    def get_diagnostics(self):
+        """Get diagnostic information about the proxy."""
+        return {
+            "port": self.port,
+            "clients": self.clients,
+            "forwarded_commands": self.forwarded_commands,
+        }
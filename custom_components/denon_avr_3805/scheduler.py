@@ -0,0 +1,321 @@
+"""Command scheduling for the Denon AVR-3805 serial link."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+# Priority classes, lower values are served first
+PRIORITY_INTERACTIVE = 0  # Control commands triggered by a user
+PRIORITY_BACKGROUND = 1   # Status polling and keepalive probes
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BACKGROUND: "background",
+}
+
+
+class CommandQueueFullError(Exception):
+    """Raised when too many commands are already waiting for the link."""
+
+
+@dataclass
+class QueueStats:
+    """Queue wait statistics for one priority class."""
+    scheduled: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        """Average time a command waited for the link."""
+        if self.scheduled == 0:
+            return 0.0
+        return self.total_wait / self.scheduled
+
+    def record_wait(self, wait: float) -> None:
+        """Record how long a command waited before it got the link."""
+        self.scheduled += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+
+class CommandScheduler:
+    """Hand out exclusive use of the link by priority, first come first served within a class.
+
+    Interactive commands always go ahead of queued background queries, so a
+    user action never waits behind a poll cycle for more than the command
+    currently on the wire.
+    """
+
+    def __init__(
+        self,
+        max_queue_depth: int = 16,
+        timeouts: Optional[Dict[int, float]] = None,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._max_queue_depth = max_queue_depth
+        self._timeouts = timeouts or {}
+        self._busy = False
+        self._queue: List[List[Any]] = []
+        self._sequence = itertools.count()
+        self.stats: Dict[int, QueueStats] = {
+            priority: QueueStats() for priority in PRIORITY_NAMES
+        }
+
+    @property
+    def queued(self) -> int:
+        """Return the number of commands waiting for the link."""
+        return len(self._queue)
+
+    @asynccontextmanager
+    async def slot(self, priority: int, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """Hold the link for one command (or one pipelined batch).
+
+        Waits at most the queue timeout of the priority class, or ``timeout``
+        if that is shorter.
+        """
+        await self._acquire(priority, timeout)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int, timeout: Optional[float] = None) -> None:
+        """Wait until the link is free for a command of the given priority."""
+        stats = self.stats[priority]
+        limit = self._timeouts.get(priority)
+        if timeout is not None:
+            limit = timeout if limit is None else min(limit, timeout)
+        loop = asyncio.get_running_loop()
+
+        if not self._busy and not self._queue:
+            self._busy = True
+            stats.record_wait(0.0)
+            return
+
+        if len(self._queue) >= self._max_queue_depth:
+            stats.rejected += 1
+            raise CommandQueueFullError(
+                f"{len(self._queue)} commands already waiting for the AVR"
+            )
+
+        start = loop.time()
+        future = loop.create_future()
+        entry = [priority, next(self._sequence), future]
+        heapq.heappush(self._queue, entry)
+
+        try:
+            await asyncio.wait_for(future, timeout=limit)
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # The link was handed to us just as we gave up, pass it on
+                self._release()
+            elif entry in self._queue:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+            if isinstance(e, asyncio.TimeoutError):
+                stats.timed_out += 1
+                _LOGGER.debug(
+                    "Gave up waiting %.1fs for the link (%s)",
+                    loop.time() - start, PRIORITY_NAMES[priority],
+                )
+            raise
+
+        stats.record_wait(loop.time() - start)
+
+    def _release(self) -> None:
+        """Hand the link to the next waiting command, or mark it free."""
+        while self._queue:
+            _, _, future = heapq.heappop(self._queue)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._busy = False
+
+    def get_diagnostics(self) -> Dict[str, Any]:
+        """Get queue statistics per priority class."""
+        return {
+            "queued": self.queued,
+            **{
+                name: {
+                    "scheduled": self.stats[priority].scheduled,
+                    "rejected": self.stats[priority].rejected,
+                    "timed_out": self.stats[priority].timed_out,
+                    "average_wait": round(self.stats[priority].average_wait, 3),
+                    "max_wait": round(self.stats[priority].max_wait, 3),
+                }
+                for priority, name in PRIORITY_NAMES.items()
+            },
+        }
+
+
+class AdaptivePacer:
+    """Derive command spacing from measured AVR response times and failures.
+
+    Round-trip times and the failure rate are tracked as moving averages.
+    The gap between commands and the settle delay after a command scale with
+    them, clamped to the configured bounds, so a responsive unit is driven as
+    fast as it answers and a busy one is given more room.
+    """
+
+    SMOOTHING = 0.2          # Weight of a new sample in the moving averages
+    GAP_FACTOR = 0.5         # Command gap as a fraction of the round-trip time
+    SETTLE_FACTOR = 1.5      # Settle delay as a multiple of the round-trip time
+    FAILURE_PENALTY = 4.0    # How strongly failures stretch both delays
+
+    def __init__(
+        self,
+        command_gap: float = 0.1,
+        min_command_gap: float = 0.05,
+        max_command_gap: float = 0.5,
+        settle_delay: float = 0.3,
+        min_settle_delay: float = 0.05,
+        max_settle_delay: float = 1.0,
+    ) -> None:
+        """Initialize with the delays to use until the first measurements arrive."""
+        self._initial_command_gap = command_gap
+        self._initial_settle_delay = settle_delay
+        self._min_command_gap = min_command_gap
+        self._max_command_gap = max_command_gap
+        self._min_settle_delay = min_settle_delay
+        self._max_settle_delay = max_settle_delay
+        self._last_write: Optional[float] = None
+        self.round_trip: Optional[float] = None
+        self.failure_rate = 0.0
+        self.samples = 0
+        self.failures = 0
+
+    def record_response(self, round_trip: float) -> None:
+        """Record the round-trip time of an answered command."""
+        self.samples += 1
+        if self.round_trip is None:
+            self.round_trip = round_trip
+        else:
+            self.round_trip += self.SMOOTHING * (round_trip - self.round_trip)
+        self.failure_rate -= self.SMOOTHING * self.failure_rate
+
+    def record_failure(self) -> None:
+        """Record a command the AVR did not answer."""
+        self.failures += 1
+        self.failure_rate += self.SMOOTHING * (1.0 - self.failure_rate)
+
+    @property
+    def command_gap(self) -> float:
+        """Minimum time between two writes to the AVR."""
+        if self.round_trip is None:
+            return self._initial_command_gap
+        gap = self.round_trip * self.GAP_FACTOR * (1 + self.FAILURE_PENALTY * self.failure_rate)
+        return min(max(gap, self._min_command_gap), self._max_command_gap)
+
+    @property
+    def settle_delay(self) -> float:
+        """Time to give the AVR after connecting or a control command before querying it."""
+        if self.round_trip is None:
+            return self._initial_settle_delay
+        delay = self.round_trip * self.SETTLE_FACTOR * (1 + self.FAILURE_PENALTY * self.failure_rate)
+        return min(max(delay, self._min_settle_delay), self._max_settle_delay)
+
+    async def wait_for_gap(self) -> None:
+        """Sleep until the command gap since the previous write has passed."""
+        loop = asyncio.get_running_loop()
+        if self._last_write is not None:
+            remaining = self._last_write + self.command_gap - loop.time()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+        self._last_write = loop.time()
+
+    def get_diagnostics(self) -> Dict[str, Any]:
+        """Get the current measurements and the delays derived from them."""
+        return {
+            "round_trip": round(self.round_trip, 4) if self.round_trip is not None else None,
+            "failure_rate": round(self.failure_rate, 3),
+            "samples": self.samples,
+            "failures": self.failures,
+            "command_gap": round(self.command_gap, 3),
+            "settle_delay": round(self.settle_delay, 3),
+        }
+
+
+class LinkThrottle:
+    """Token bucket that paces writes to what the serial line and the AVR can take.
+
+    Tokens are seconds of link time and refill in real time. A write costs
+    the time its bytes need on the wire (``bits_per_byte`` bits each at
+    ``baud_rate``) plus ``command_cost`` per command for the AVR to process
+    it. A write goes out once the bucket is no longer in debt, so a command
+    never reaches the AVR before the previous one has been transmitted and
+    processed; ``burst`` lets that much link time be sent ahead.
+    """
+
+    def __init__(
+        self,
+        baud_rate: int = 9600,
+        bits_per_byte: int = 10,
+        command_cost: float = 0.05,
+        burst: float = 0.0,
+    ) -> None:
+        """Initialize with a full bucket."""
+        self.baud_rate = baud_rate
+        self.bits_per_byte = bits_per_byte
+        self.command_cost = command_cost
+        self.burst = burst
+        self._tokens = burst
+        self._updated: Optional[float] = None
+        self.bytes_sent = 0
+        self.commands_sent = 0
+        self.throttled = 0
+        self.total_delay = 0.0
+
+    def cost(self, data: bytes) -> float:
+        """Return the link time a write takes, transmission plus processing."""
+        commands = data.count(b"\r")
+        return len(data) * self.bits_per_byte / self.baud_rate + commands * self.command_cost
+
+    def delay(self) -> float:
+        """Return how long the next write has to wait."""
+        self._refill()
+        return max(0.0, -self._tokens)
+
+    async def acquire(self, data: bytes, timeout: Optional[float] = None) -> None:
+        """Wait until ``data`` may be written and charge it to the bucket.
+
+        Raises asyncio.TimeoutError without charging anything if that would
+        take longer than ``timeout``.
+        """
+        delay = self.delay()
+        if delay > 0:
+            if timeout is not None and delay > timeout:
+                raise asyncio.TimeoutError(f"Link busy for another {delay:.2f}s")
+            self.throttled += 1
+            self.total_delay += delay
+            await asyncio.sleep(delay)
+            self._refill()
+        self._tokens -= self.cost(data)
+        self.bytes_sent += len(data)
+        self.commands_sent += data.count(b"\r")
+
+    def _refill(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if self._updated is not None:
+            self._tokens = min(self.burst, self._tokens + now - self._updated)
+        self._updated = now
+
+    def get_diagnostics(self) -> Dict[str, Any]:
+        """Get the link model and how often it held writes back."""
+        return {
+            "baud_rate": self.baud_rate,
+            "command_cost": self.command_cost,
+            "bytes_sent": self.bytes_sent,
+            "commands_sent": self.commands_sent,
+            "throttled": self.throttled,
+            "total_delay": round(self.total_delay, 3),
+        }
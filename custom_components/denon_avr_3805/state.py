@@ -0,0 +1,178 @@
+"""Parsed state of the Denon AVR-3805 as held by the coordinator."""
+from __future__ import annotations
+
+import time
+from types import MappingProxyType
+from typing import AbstractSet, Any, Dict, Mapping, Optional, Union
+
+from .protocol import MasterVolume
+from .protocol import Mute
+from .protocol import Power
+from .protocol import Source
+from .protocol import SurroundMode
+from .protocol import Zone
+from .protocol import parse_text
+
+# Coordinator fields, named after the status query that fills them
+FIELDS = ("power", "volume", "mute", "input", "surround")
+
+
+class AvrState:
+    """Immutable snapshot of the AVR status, parsed once per update.
+
+    Entities read the typed attributes; ``raw`` keeps the response each field
+    was parsed from for diagnostics, ``updated`` the monotonic time it was
+    last refreshed and ``assumed`` the fields holding a value the AVR has not
+    reported (yet).
+    """
+
+    __slots__ = (
+        "power", "volume", "muted", "source", "surround", "raw", "updated", "assumed"
+    )
+
+    power: Optional[bool]
+    volume: Optional[Union[int, float]]
+    muted: Optional[bool]
+    source: Optional[str]
+    surround: Optional[str]
+    raw: Mapping[str, Optional[str]]
+    updated: Mapping[str, float]
+    assumed: AbstractSet[str]
+
+    def __init__(
+        self,
+        raw: Optional[Mapping[str, Optional[str]]] = None,
+        updated: Optional[Mapping[str, float]] = None,
+        assumed: AbstractSet[str] = frozenset(),
+    ) -> None:
+        """Parse the raw responses into typed fields."""
+        raw = dict(raw or {})
+        set_attribute = object.__setattr__
+        set_attribute(self, "raw", MappingProxyType(raw))
+        set_attribute(self, "updated", MappingProxyType(dict(updated or {})))
+        set_attribute(self, "assumed", frozenset(assumed))
+        set_attribute(self, "power", _parse_power(raw.get("power")))
+        set_attribute(self, "volume", _parse_volume(raw.get("volume")))
+        set_attribute(self, "muted", _parse_mute(raw.get("mute")))
+        set_attribute(self, "source", _parse_source(raw.get("input")))
+        set_attribute(self, "surround", _parse_surround(raw.get("surround")))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse changes, build a new state with update() instead."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        """States are equal when they hold the same responses."""
+        return isinstance(other, AvrState) and other.raw == self.raw
+
+    def __hash__(self) -> int:
+        """Hash consistently with equality."""
+        return hash(tuple(sorted(self.raw.items())))
+
+    def __repr__(self) -> str:
+        """Return a readable representation for logging."""
+        return (
+            f"AvrState(power={self.power}, volume={self.volume}, "
+            f"muted={self.muted}, source={self.source}, surround={self.surround})"
+        )
+
+    @property
+    def has_status(self) -> bool:
+        """Return True if at least one field holds a response from the AVR."""
+        return any(value is not None for value in self.raw.values())
+
+    @property
+    def confirmed(self) -> Dict[str, Optional[str]]:
+        """Return the responses of the fields the AVR itself reported."""
+        return {
+            field: value
+            for field, value in self.raw.items()
+            if field in self.updated and field not in self.assumed
+        }
+
+    def get(self, field: str) -> Optional[str]:
+        """Return the raw response a field was parsed from."""
+        return self.raw.get(field)
+
+    def matches(self, field: str, text: Optional[str]) -> bool:
+        """Return True if a field holds the state a status line describes.
+
+        Parsed values are compared, so a main zone answer (ZMON) matches
+        PWON. A field that cannot be parsed matches nothing.
+        """
+        value = _PARSERS[field](self.raw.get(field))
+        return value is not None and value == _PARSERS[field](text)
+
+    def update(
+        self, responses: Mapping[str, Optional[str]], now: Optional[float] = None
+    ) -> AvrState:
+        """Return a new state with the given fields replaced by fresh responses.
+
+        Only fields that got an answer are stamped with ``now``, so a field
+        the AVR did not answer keeps the time it was last heard of.
+        """
+        if now is None:
+            now = time.monotonic()
+        answered = {field: now for field, value in responses.items() if value is not None}
+        return AvrState(
+            {**self.raw, **responses},
+            {**self.updated, **answered},
+            self.assumed - answered.keys(),
+        )
+
+    def assume(self, field: str, value: Optional[str]) -> AvrState:
+        """Return a new state with a value the AVR has not reported (yet).
+
+        Used for optimistic updates: the field is not stamped, so it stays
+        due for polling as if the value had not changed, and it is left out
+        of ``confirmed`` until the AVR reports it.
+        """
+        return AvrState({**self.raw, field: value}, self.updated, self.assumed | {field})
+
+    def as_dict(self) -> Dict[str, Optional[str]]:
+        """Return the raw responses, e.g. for diagnostics."""
+        return dict(self.raw)
+
+
+def _parse_power(text: Optional[str]) -> Optional[bool]:
+    event = parse_text(text)
+    if isinstance(event, Power):
+        return event.on
+    # Some AVRs only answer the main zone query (ZMON / ZM ON)
+    if isinstance(event, Zone) and event.zone == "main":
+        return event.on
+    return None
+
+
+def _parse_volume(text: Optional[str]) -> Optional[Union[int, float]]:
+    event = parse_text(text)
+    if not isinstance(event, MasterVolume):
+        return None
+    # Keep whole steps as integers, half steps (MV505) as 50.5
+    level = event.level
+    return int(level) if level.is_integer() else level
+
+
+def _parse_mute(text: Optional[str]) -> Optional[bool]:
+    event = parse_text(text)
+    return event.muted if isinstance(event, Mute) else None
+
+
+def _parse_source(text: Optional[str]) -> Optional[str]:
+    event = parse_text(text)
+    return event.source if isinstance(event, Source) else None
+
+
+def _parse_surround(text: Optional[str]) -> Optional[str]:
+    event = parse_text(text)
+    return event.mode if isinstance(event, SurroundMode) else None
+
+
+# Parser of each coordinator field
+_PARSERS = {
+    "power": _parse_power,
+    "volume": _parse_volume,
+    "mute": _parse_mute,
+    "input": _parse_source,
+    "surround": _parse_surround,
+}
@@ -22,6 +22,8 @@ async def async_setup_entry(hass, entry, async_add_devices):
 class DenonAvr3805PowerSwitch(DenonAvr3805Entity, SwitchEntity):
     """Denon AVR-3805 power switch class."""
 
+    _fields = ("power",)
+
     @property
     def unique_id(self):
         """Return a unique ID for this entity."""
@@ -29,17 +31,21 @@ class DenonAvr3805PowerSwitch(DenonAvr3805Entity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):  # pylint: disable=unused-argument
         """Turn on the AVR."""
-        await self.coordinator.api.connect()
-        await self.coordinator.api.async_power_on()
-        await self.coordinator.api.disconnect()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_execute_and_refresh_field(
+            self.coordinator.api.async_power_on,
+            "power",
+            self.coordinator.api.async_get_power_status,
+            expected="PWON",
+        )
 
     async def async_turn_off(self, **kwargs):  # pylint: disable=unused-argument
         """Turn off the AVR."""
-        await self.coordinator.api.connect()
-        await self.coordinator.api.async_power_off()
-        await self.coordinator.api.disconnect()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_execute_and_refresh_field(
+            self.coordinator.api.async_power_off,
+            "power",
+            self.coordinator.api.async_get_power_status,
+            expected="PWSTANDBY",
+        )
 
     @property
     def translation_key(self):
@@ -54,16 +60,14 @@ class DenonAvr3805PowerSwitch(DenonAvr3805Entity, SwitchEntity):
     @property
     def is_on(self):
         """Return true if the AVR is on."""
-        power_status = self.coordinator.data.get("power")
-        if power_status and isinstance(power_status, str):
-            # Handle different power response formats
-            return power_status in ["PWON", "ON", "ZM ON"]
-        return False
+        return bool(self.coordinator.data.power)
 
 
 class DenonAvr3805MuteSwitch(DenonAvr3805Entity, SwitchEntity):
     """Denon AVR-3805 mute switch class."""
 
+    _fields = ("mute",)
+
     @property
     def unique_id(self):
         """Return a unique ID for this entity."""
@@ -80,6 +84,7 @@ class DenonAvr3805MuteSwitch(DenonAvr3805Entity, SwitchEntity):
             self.coordinator.api.async_mute_on,
             "mute",
             self.coordinator.api.async_get_mute_status,
+            expected="MUON",
         )
 
     async def async_turn_off(self, **kwargs):  # pylint: disable=unused-argument
@@ -88,6 +93,7 @@ class DenonAvr3805MuteSwitch(DenonAvr3805Entity, SwitchEntity):
             self.coordinator.api.async_mute_off,
             "mute",
             self.coordinator.api.async_get_mute_status,
+            expected="MUOFF",
         )
 
     @property
@@ -103,8 +109,4 @@ class DenonAvr3805MuteSwitch(DenonAvr3805Entity, SwitchEntity):
     @property
     def is_on(self):
         """Return true if the AVR is muted."""
-        mute_status = self.coordinator.data.get("mute")
-        if mute_status and isinstance(mute_status, str):
-            # Handle different mute response formats
-            return mute_status in ["MUON", "ON"]
-        return False
+        return bool(self.coordinator.data.muted)
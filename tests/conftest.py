@@ -4,6 +4,8 @@ from unittest.mock import patch
 
 import pytest
 
+from .fake_avr import FakeDenonServer
+
 pytest_plugins = "pytest_homeassistant_custom_component"
 
 
@@ -59,6 +61,11 @@ def bypass_connect_fixture():
     ), patch(
         "custom_components.denon_avr_3805.api.DenonAvr3805ApiClient.async_get_input",
         new=AsyncMock(return_value="SITV"),
+    ), patch(
+        "custom_components.denon_avr_3805.api.DenonAvr3805ApiClient.async_query_many",
+        new=AsyncMock(
+            return_value={"power": "PWON", "volume": "MV50", "mute": "MUOFF", "input": "SITV"}
+        ),
     ), patch(
         "custom_components.denon_avr_3805.api.DenonAvr3805ApiClient._send_command",
         new=AsyncMock(return_value=None),
@@ -79,3 +86,11 @@ def error_on_connect_fixture():
     ):
         yield
 
+
+@pytest.fixture
+async def fake_server(socket_enabled):
+    """Run a fake AVR TCP server for the duration of a test."""
+    server = FakeDenonServer()
+    await server.start()
+    yield server
+    await server.stop()
@@ -0,0 +1,79 @@
+"""A fake Denon AVR-3805 behind ser2net, for tests that need a real TCP peer."""
+import asyncio
+
+# Fixed responses this fake AVR gives to status queries.
+_RESPONSES = {
+    "PW?": "PWON",
+    "MU?": "MUOFF",
+    "MV?": "MV50",
+    "SI?": "SITV",
+    "MS?": "MSSTEREO",
+}
+
+
+class FakeDenonServer:
+    """A minimal TCP server that emulates Denon AVR-3805 serial-over-TCP responses."""
+
+    def __init__(self):
+        self.received = []
+        self.port = None
+        self.connections = 0
+        # Sent to every new connection, like serial output ser2net buffered while nobody was connected
+        self.backlog = b""
+        # Echo control commands back, as the AVR reports the state they lead to
+        self.echo = False
+        # Seconds to wait before answering a command, like an AVR busy switching
+        self.delays = {}
+        self._server = None
+        self._writers = []
+
+    async def start(self):
+        """Start listening on an ephemeral localhost port."""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop the server."""
+        self._server.close()
+        await self._server.wait_closed()
+
+    def drop_connections(self):
+        """Close every open client connection, as a restarted ser2net would."""
+        for writer in self._writers:
+            writer.close()
+        self._writers.clear()
+
+    async def push(self, line):
+        """Send an unsolicited status line, as the AVR does after a front panel change."""
+        for writer in self._writers:
+            writer.write((line + "\r").encode())
+            await writer.drain()
+
+    async def _reply_later(self, writer, response, delay):
+        await asyncio.sleep(delay)
+        if response is not None and not writer.is_closing():
+            writer.write((response + "\r").encode())
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._writers.append(writer)
+        if self.backlog:
+            writer.write(self.backlog)
+        try:
+            while True:
+                line = await reader.readuntil(b"\r")
+                command = line.decode().strip()
+                self.received.append(command)
+                response = _RESPONSES.get(command)
+                if response is None and self.echo and not command.endswith("?"):
+                    response = command
+                if command in self.delays:
+                    # Answered later without holding up the commands behind it
+                    asyncio.ensure_future(self._reply_later(writer, response, self.delays[command]))
+                elif response is not None:
+                    writer.write((response + "\r").encode())
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
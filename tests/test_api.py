@@ -5,57 +5,11 @@ import pytest
 
 from custom_components.denon_avr_3805.api import ConnectionStats
 from custom_components.denon_avr_3805.api import DenonAvr3805ApiClient
-
-# Fixed responses this fake AVR gives to status queries.
-_RESPONSES = {
-    "PW?": "PWON",
-    "MU?": "MUOFF",
-    "MV?": "MV50",
-    "SI?": "SITV",
-}
-
-
-class FakeDenonServer:
-    """A minimal TCP server that emulates Denon AVR-3805 serial-over-TCP responses."""
-
-    def __init__(self):
-        self.received = []
-        self.port = None
-        self._server = None
-
-    async def start(self):
-        """Start listening on an ephemeral localhost port."""
-        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
-        self.port = self._server.sockets[0].getsockname()[1]
-
-    async def stop(self):
-        """Stop the server."""
-        self._server.close()
-        await self._server.wait_closed()
-
-    async def _handle(self, reader, writer):
-        try:
-            while True:
-                line = await reader.readuntil(b"\r")
-                command = line.decode().strip()
-                self.received.append(command)
-                response = _RESPONSES.get(command)
-                if response is not None:
-                    writer.write((response + "\r").encode())
-                    await writer.drain()
-        except (asyncio.IncompleteReadError, ConnectionResetError):
-            pass
-        finally:
-            writer.close()
-
-
-@pytest.fixture
-async def fake_server(socket_enabled):
-    """Run a fake AVR TCP server for the duration of a test."""
-    server = FakeDenonServer()
-    await server.start()
-    yield server
-    await server.stop()
+from custom_components.denon_avr_3805.api import ResponseRouter
+from custom_components.denon_avr_3805.api import TransportRegistry
+from custom_components.denon_avr_3805.api import scene_command
+from custom_components.denon_avr_3805.breaker import CircuitOpenError
+from custom_components.denon_avr_3805.scheduler import PRIORITY_INTERACTIVE
 
 
 async def test_connect_and_disconnect(fake_server):
@@ -70,6 +24,45 @@ async def test_connect_and_disconnect(fake_server):
     assert not client.is_connected
 
 
+async def test_connect_discards_stale_input(fake_server):
+    """Output buffered before we connected should not be taken as a reply."""
+    fake_server.backlog = b"STANDBY\rMUON\rMV4"
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"resync_timeout": 0.1}
+    )
+    received = []
+    client.add_listener(lambda event: received.append(event.raw))
+
+    connecting = asyncio.ensure_future(client.connect())
+    await asyncio.sleep(0.05)
+    # The rest of the partial line arrives while resyncing and is dropped with it
+    await fake_server.push("5")
+    await connecting
+
+    assert await client.async_get_power_status() == "PWON"
+    assert await client.async_get_volume() == "MV50"
+    await client.disconnect()
+    assert received == []
+
+
+async def test_connect_drops_stale_line_ending_after_resync(fake_server):
+    """The rest of a stale line arriving after resyncing should not reach anyone."""
+    fake_server.backlog = b"MUON\rMV4"
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"resync_timeout": 0.05}
+    )
+    received = []
+    client.add_listener(lambda event: received.append(event.raw))
+
+    await client.connect()
+    await fake_server.push("5")
+    await fake_server.push("MUOFF")
+    await asyncio.sleep(0.05)
+
+    await client.disconnect()
+    assert received == ["MUOFF"]
+
+
 async def test_connect_with_retry_failure(socket_enabled):
     """Connecting to a closed port should fail after retries and update stats."""
     client = DenonAvr3805ApiClient(
@@ -85,6 +78,36 @@ async def test_connect_with_retry_failure(socket_enabled):
         await client.connect()
 
 
+async def test_circuit_breaker_fails_fast_while_unreachable(socket_enabled):
+    """Once the breaker opens, connecting should be rejected without network attempts."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1",
+        1,
+        config={
+            "max_retries": 2,
+            "retry_delay": 0.01,
+            "breaker_threshold": 2,
+            "breaker_reset_timeout": 0.1,
+        },
+    )
+
+    assert await client.connect_with_retry() is False
+    assert await client.connect_with_retry() is False
+    assert client.breaker_state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        await client.connect()
+    assert client.connection_stats.failed_connections == 2
+
+    # After the reset timeout a single probe attempt is made
+    await asyncio.sleep(0.12)
+    assert client.breaker_state == "half_open"
+    assert await client.connect_with_retry() is False
+    assert client.connection_stats.failed_connections == 3
+    assert client.breaker_state == "open"
+    assert client.get_diagnostics()["breaker"]["reset_timeout"] == pytest.approx(0.2)
+
+
 async def test_get_power_status(fake_server):
     """A power query should return the AVR's power state."""
     client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
@@ -158,6 +181,37 @@ async def test_set_volume_out_of_range_raises(level):
         await client.async_set_volume(level)
 
 
+async def test_confirmed_command_returns_echo(fake_server):
+    """A confirmed control command should return the AVR's echo instead of notifying listeners."""
+    fake_server.echo = True
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    received = []
+    client.add_listener(lambda event: received.append(event.raw))
+    await client.connect()
+
+    assert await client.async_mute_on(confirm=True) == "MUON"
+    assert await client.async_set_volume(45, confirm=True) == "MV45"
+    # Unconfirmed commands leave the echo to the listeners
+    assert await client.async_mute_off() is None
+    await asyncio.sleep(0.05)
+
+    await client.disconnect()
+    assert received == ["MUOFF"]
+
+
+async def test_confirmed_command_without_echo(fake_server):
+    """A missing echo should give None after echo_timeout without counting as a failure."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"echo_timeout": 0.05}
+    )
+    await client.connect()
+
+    assert await client.async_power_on(confirm=True) is None
+
+    await client.disconnect()
+    assert client.connection_stats.failed_commands == 0
+
+
 async def test_select_input_and_get_input(fake_server):
     """Selecting an input should send the SI command and the query should parse the source."""
     client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
@@ -171,7 +225,7 @@ async def test_select_input_and_get_input(fake_server):
 
 
 async def test_get_all_status(fake_server):
-    """The diagnostic helper should query power, volume, mute and input."""
+    """The diagnostic helper should query every status field."""
     client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
     await client.connect()
 
@@ -183,9 +237,97 @@ async def test_get_all_status(fake_server):
         "volume": "MV50",
         "mute": "MUOFF",
         "input": "SITV",
+        "surround": "MSSTEREO",
     }
 
 
+async def test_query_many_matches_responses_by_prefix(fake_server):
+    """Pipelined queries should each get the response carrying their prefix."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+
+    status = await client.async_query_many(
+        [("input", "SI?", "SI"), ("power", "PW?", "PW"), ("mute", "MU?", "MU")]
+    )
+
+    await client.disconnect()
+    assert status == {"input": "SITV", "power": "PWON", "mute": "MUOFF"}
+    assert fake_server.received == ["SI?", "PW?", "MU?"]
+
+
+async def test_query_many_returns_partial_results(fake_server):
+    """Queries the AVR never answers should come back as None without losing the rest."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"read_timeout": 0.1}
+    )
+    await client.connect()
+
+    status = await client.async_query_many(
+        [("power", "PW?", "PW"), ("unknown", "ZZ?", "ZZ"), ("volume", "MV?", "MV")]
+    )
+
+    await client.disconnect()
+    assert status == {"power": "PWON", "unknown": None, "volume": "MV50"}
+    assert client.connection_stats.failed_commands == 1
+
+
+async def test_query_many_times_out_each_query_on_its_own(fake_server):
+    """Each query should get read_timeout from its own write, not from the last one."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1",
+        fake_server.port,
+        config={"read_timeout": 0.3, "command_cost": 0.25},
+    )
+    await client.connect()
+    # Written first, answered after its own read_timeout but within the last write's
+    fake_server.delays["PW?"] = 0.6
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    status = await client.async_query_many(
+        [("power", "PW?", "PW"), ("mute", "MU?", "MU"), ("input", "SI?", "SI")]
+    )
+    assert loop.time() - start < 1.0
+
+    await client.disconnect()
+    assert status == {"power": None, "mute": "MUOFF", "input": "SITV"}
+
+
+async def test_timeout_bounds_retries_and_backoff(socket_enabled):
+    """An overall timeout should stop retrying instead of sleeping past it."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", 1, config={"max_retries": 3, "retry_delay": 1.0}
+    )
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    assert await client.connect_with_retry(timeout=0.5) is False
+    assert loop.time() - start < 0.5
+
+
+async def test_timeout_bounds_waiting_for_answers(fake_server):
+    """Queries should give up when the overall timeout passes, before read_timeout."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"read_timeout": 3.0}
+    )
+    await client.connect()
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    status = await client.async_query_many(
+        [("power", "PW?", "PW"), ("unknown", "ZZ?", "ZZ")], timeout=0.2
+    )
+    assert loop.time() - start < 1.0
+    assert status == {"power": "PWON", "unknown": None}
+
+    start = loop.time()
+    assert await client.async_get_power_status(timeout=0.5) == "PWON"
+    assert await client._send_command("ZZ?", "ZZ", deadline=loop.time() + 0.2) is None
+    assert loop.time() - start < 1.0
+
+    await client.disconnect()
+
+
 async def test_get_volume_alt_and_power_alt(fake_server):
     """Alternative query helpers should fall back correctly."""
     client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
@@ -231,6 +373,320 @@ async def test_get_diagnostics(fake_server):
     assert diagnostics["connection"]["host"] == "127.0.0.1"
     assert diagnostics["connection"]["port"] == fake_server.port
     assert diagnostics["stats"]["total_commands"] >= 1
+    assert diagnostics["scheduler"]["background"]["scheduled"] >= 1
+
+
+async def test_persistent_connection_survives_session(fake_server):
+    """In persistent mode ending a session should keep the link open."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"persistent_connection": True}
+    )
+    async with client.session():
+        pass
+
+    assert client.is_connected
+    assert await client.async_get_power_status() == "PWON"
+    assert fake_server.connections == 1
+
+    await client.async_close()
+    assert not client.is_connected
+
+
+async def test_concurrent_sessions_share_one_connection(fake_server):
+    """Overlapping sessions should use a single link that outlives both."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"idle_timeout": 0.05}
+    )
+
+    async def poll():
+        async with client.session():
+            return await client.async_get_power_status()
+
+    async def command():
+        async with client.session():
+            await client.async_mute_on()
+            await asyncio.sleep(0.02)
+            return await client.async_get_mute_status()
+
+    assert await asyncio.gather(poll(), command()) == ["PWON", "MUOFF"]
+    assert fake_server.connections == 1
+    assert client.leases == 0
+
+    # The link is closed once no session has used it for the idle timeout
+    assert client.is_connected
+    await asyncio.sleep(0.1)
+    assert not client.is_connected
+
+
+async def test_new_session_cancels_idle_close(fake_server):
+    """A session started within the idle timeout should reuse the open link."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"idle_timeout": 0.1}
+    )
+    async with client.session():
+        pass
+    await asyncio.sleep(0.05)
+
+    async with client.session():
+        await asyncio.sleep(0.1)
+        assert client.is_connected
+        assert await client.async_get_input() == "SITV"
+
+    assert fake_server.connections == 1
+    await client.async_close()
+
+
+async def test_session_started_during_idle_close_gets_a_working_link(fake_server):
+    """A lease taken while the idle close is disconnecting should end up connected."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"idle_timeout": 0.05}
+    )
+    disconnect = client.disconnect
+
+    async def slow_disconnect():
+        await asyncio.sleep(0.1)
+        await disconnect()
+
+    client.disconnect = slow_disconnect
+    async with client.session():
+        pass
+    await asyncio.sleep(0.08)  # The idle close is now in the middle of disconnecting
+
+    async with client.session():
+        await asyncio.sleep(0.1)  # Past the end of the idle close
+        assert client.leases == 1
+        assert client.is_connected
+        assert await client.async_get_input() == "SITV"
+
+    await client.async_close()
+
+
+async def test_session_reconnects_dropped_link(fake_server):
+    """A link that drops under a live session should be reconnected by the next command."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+
+    async with client.session():
+        fake_server.drop_connections()
+        await asyncio.sleep(0.05)
+        assert await client.async_get_power_status() == "PWON"
+
+    assert fake_server.connections == 2
+    await client.async_close()
+
+
+async def test_persistent_connection_reconnects_transparently(fake_server):
+    """A dropped persistent link should be re-established by the next command."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"persistent_connection": True}
+    )
+    await client.connect()
+
+    fake_server.drop_connections()
+    await asyncio.sleep(0.05)  # let the client see the connection close
+
+    assert await client.async_get_mute_status() == "MUOFF"
+    assert fake_server.connections == 2
+
+    await client.async_close()
+
+
+async def test_write_retry_is_throttled(fake_server):
+    """A write retried on a fresh persistent link should take a throttle token again."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"persistent_connection": True}
+    )
+    await client.connect()
+
+    def broken_write(data):
+        raise ConnectionResetError("link broke")
+
+    client._writer.write = broken_write
+    await client._send_command("MUON")
+    await asyncio.sleep(0.05)
+    assert fake_server.received == ["MUON"]
+    assert fake_server.connections == 2
+    assert client._throttle.commands_sent == 2
+
+    await client.async_close()
+
+
+async def test_replies_survive_a_failed_write(fake_server):
+    """Queries and confirmed commands retried on a fresh link should get their answer."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"persistent_connection": True}
+    )
+    await client.connect()
+    fake_server.echo = True
+
+    def break_link():
+        def broken_write(data):
+            raise ConnectionResetError("link broke")
+
+        client._writer.write = broken_write
+
+    break_link()
+    assert await client.async_get_mute_status() == "MUOFF"
+    break_link()
+    assert await client.async_mute_on(confirm=True) == "MUON"
+    break_link()
+    assert await client.async_query_many(
+        [("power", "PW?", "PW"), ("input", "SI?", "SI")]
+    ) == {"power": "PWON", "input": "SITV"}
+    assert fake_server.connections == 4
+
+    await client.async_close()
+
+
+async def test_keepalive_probes_idle_connection(fake_server):
+    """An idle persistent link should be probed with a power query."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1",
+        fake_server.port,
+        config={"persistent_connection": True, "keepalive_interval": 0.05},
+    )
+    await client.connect()
+
+    await asyncio.sleep(0.2)
+
+    await client.async_close()
+    assert "PW?" in fake_server.received
+
+
+async def test_listener_receives_unsolicited_lines(fake_server):
+    """Status lines the AVR sends on its own should reach registered listeners."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    received = []
+    remove_listener = client.add_listener(lambda event: received.append(event.raw))
+    await client.connect()
+
+    await fake_server.push("MV45")
+    await fake_server.push("SIDVD")
+    await asyncio.sleep(0.05)
+
+    remove_listener()
+    await fake_server.push("MUON")
+    await asyncio.sleep(0.05)
+
+    await client.disconnect()
+    assert received == ["MV45", "SIDVD"]
+
+
+async def test_query_ignores_unsolicited_line(fake_server):
+    """A pushed line arriving before the reply should not be taken as the answer."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+
+    await fake_server.push("MUON")
+    await asyncio.sleep(0.05)
+
+    assert await client.async_get_mute_status() == "MUOFF"
+
+    await client.disconnect()
+
+
+async def test_push_during_query_reaches_listener(fake_server):
+    """A pushed line for another command group should not be swallowed by a pending query."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"read_timeout": 0.2}
+    )
+    received = []
+    client.add_listener(lambda event: received.append(event.raw))
+    await client.connect()
+
+    query = asyncio.ensure_future(client._send_command("ZZ?", "ZZ"))
+    await asyncio.sleep(0.05)
+    await fake_server.push("MV45")
+
+    assert await query is None
+    await client.disconnect()
+    assert received == ["MV45"]
+
+
+async def test_overlapping_queries_get_their_own_responses(fake_server):
+    """Queries running concurrently should each be resolved with their own reply."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+
+    results = await asyncio.gather(
+        client.async_get_power_status(),
+        client.async_get_volume(),
+        client.async_get_input(),
+    )
+
+    await client.disconnect()
+    assert results == ["PWON", "MV50", "SITV"]
+
+
+async def test_queued_volume_sets_are_coalesced(fake_server):
+    """Only the latest of several queued absolute volume commands should be sent."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+
+    async with client._scheduler.slot(PRIORITY_INTERACTIVE):
+        sends = [
+            asyncio.ensure_future(client.async_set_volume(level)) for level in (40, 41, 42)
+        ]
+        sends.append(asyncio.ensure_future(client.async_select_input("DVD")))
+        sends.append(asyncio.ensure_future(client.async_select_input("CD")))
+        await asyncio.sleep(0.01)
+    await asyncio.gather(*sends)
+    await asyncio.sleep(0.05)
+
+    await client.disconnect()
+    assert fake_server.received == ["MV42", "SICD"]
+    assert client.connection_stats.coalesced_commands == 3
+
+
+async def test_queued_volume_steps_fold_into_absolute_set(fake_server):
+    """Repeated MVUP commands should collapse into one set when the volume is known."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+    assert await client.async_get_volume() == "MV50"
+
+    async with client._scheduler.slot(PRIORITY_INTERACTIVE):
+        steps = [asyncio.ensure_future(client.async_volume_up()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+    await asyncio.gather(*steps)
+    await asyncio.sleep(0.05)
+
+    await client.disconnect()
+    # The first step goes out as is, the others are folded into the final level
+    assert fake_server.received[1:] == ["MVUP", "MV53"]
+
+
+async def test_volume_steps_are_not_folded_without_known_volume(fake_server):
+    """Without a known starting volume, relative steps must be sent one by one."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+
+    async with client._scheduler.slot(PRIORITY_INTERACTIVE):
+        steps = [asyncio.ensure_future(client.async_volume_down()) for _ in range(2)]
+        await asyncio.sleep(0.01)
+    await asyncio.gather(*steps)
+    await asyncio.sleep(0.05)
+
+    await client.disconnect()
+    assert fake_server.received == ["MVDOWN", "MVDOWN"]
+
+
+async def test_response_router_serves_waiters_in_order():
+    """Waiters for the same command group should be resolved first come, first served."""
+    router = ResponseRouter()
+    first = router.register("MU")
+    second = router.register("MU")
+    other = router.register("PW")
+
+    assert router.deliver("MUON")
+    assert router.deliver("MUOFF")
+    assert not router.deliver("SIDVD")
+
+    assert first.result() == "MUON"
+    assert second.result() == "MUOFF"
+    assert router.pending == 1
+
+    router.close()
+    assert other.result() is None
+    assert router.pending == 0
 
 
 def test_connection_stats_success_rate_with_no_attempts():
@@ -247,3 +703,145 @@ def test_connection_stats_unhealthy_after_failures():
     stats.consecutive_failures = 3
     assert stats.is_healthy is False
 
+
+async def test_registry_shares_one_client_per_endpoint(fake_server):
+    """Users of the same ser2net port should share a client and its connection."""
+    registry = TransportRegistry()
+    entry_client = registry.acquire(
+        "127.0.0.1", fake_server.port, config={"persistent_connection": True}
+    )
+    flow_client = registry.acquire("127.0.0.1", fake_server.port)
+
+    assert flow_client is entry_client
+    assert registry.acquire("127.0.0.2", fake_server.port) is not entry_client
+
+    async with entry_client.session():
+        pass
+    async with flow_client.session():
+        assert await flow_client.async_get_power_status() == "PWON"
+    assert fake_server.connections == 1
+
+    # The connection stays up until the last user lets go
+    await registry.async_release(flow_client)
+    assert entry_client.is_connected
+    assert registry.get("127.0.0.1", fake_server.port) is entry_client
+
+    await registry.async_release(entry_client)
+    assert not entry_client.is_connected
+    assert registry.get("127.0.0.1", fake_server.port) is None
+
+
+async def test_cache_answers_repeated_queries(fake_server):
+    """A query asked again within the cache TTL should not go on the wire."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"cache_ttl": 5.0}
+    )
+    await client.connect()
+
+    assert await client.async_get_power_status() == "PWON"
+    assert await client.async_get_power_status() == "PWON"
+    results = await client.async_query_many([("power", "PW?", "PW"), ("mute", "MU?", "MU")])
+
+    assert results == {"power": "PWON", "mute": "MUOFF"}
+    assert fake_server.received.count("PW?") == 1
+    assert client.connection_stats.cache_hits == 2
+
+    # Pushed status keeps the cache current
+    await fake_server.push("MUON")
+    await asyncio.sleep(0.05)
+    assert await client.async_get_mute_status() == "MUON"
+    assert fake_server.received.count("MU?") == 1
+
+    # A control command makes the cached answer stale
+    await client.async_mute_off()
+    await client.async_get_mute_status()
+    assert fake_server.received.count("MU?") == 2
+    await client.disconnect()
+
+
+async def test_cache_disabled_by_default(fake_server):
+    """Without a TTL every query should reach the AVR."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+
+    await client.async_get_volume()
+    await client.async_get_volume()
+
+    await client.disconnect()
+    assert fake_server.received.count("MV?") == 2
+
+
+async def test_concurrent_identical_queries_share_one_request(fake_server):
+    """Identical queries running at the same time should be sent once."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+
+    results = await asyncio.gather(
+        client.async_get_input(),
+        client.async_get_input(),
+        client.async_query_many([("input", "SI?", "SI"), ("volume", "MV?", "MV")]),
+    )
+
+    await client.disconnect()
+    assert results[:2] == ["SITV", "SITV"]
+    assert results[2] == {"input": "SITV", "volume": "MV50"}
+    assert fake_server.received.count("SI?") == 1
+    assert client.connection_stats.shared_queries == 2
+
+
+async def test_apply_sends_only_what_changes_and_verifies_once(fake_server):
+    """A scene should skip steps already in place and verify with one batch."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+
+    results = await client.async_apply(
+        [("power", True), ("input", "DVD"), ("volume", 40), ("mute", False)],
+        current={"power": "PWON", "input": "SITV", "volume": "MV50", "mute": "MUOFF"},
+    )
+
+    await client.disconnect()
+    assert fake_server.received == ["SIDVD", "MV40", "PW?", "MV?", "MU?", "SI?"]
+    assert set(results) == {"power", "input", "volume", "mute"}
+
+
+async def test_apply_counts_main_zone_answer_as_powered_on(fake_server):
+    """An AVR that reported ZMON should not be powered on (and waited for) again."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"power_on_delay": 5.0}
+    )
+    await client.connect()
+
+    await client.async_apply(
+        [("power", True), ("mute", True)], current={"power": "ZMON", "mute": "MUOFF"}
+    )
+
+    await client.disconnect()
+    assert fake_server.received[0] == "MUON"
+    assert "PWON" not in fake_server.received
+
+
+async def test_apply_waits_after_power_on_and_forgets_stale_state(fake_server):
+    """Powering on should wait for the AVR and then send every later step."""
+    fake_server.echo = True
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"power_on_delay": 0.1}
+    )
+    await client.connect()
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await client.async_apply(
+        [("power", True), ("mute", False)],
+        current={"power": "PWSTANDBY", "mute": "MUOFF"},
+    )
+
+    await client.disconnect()
+    assert loop.time() - start >= 0.1
+    assert fake_server.received[:2] == ["PWON", "MUOFF"]
+
+
+def test_scene_command_rejects_unknown_fields():
+    """Only the known status fields can be part of a scene."""
+    with pytest.raises(ValueError):
+        scene_command("treble", 3)
+    assert scene_command("volume", 40.5) == "MV405"
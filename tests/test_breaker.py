@@ -0,0 +1,47 @@
+"""Tests for the Denon AVR-3805 circuit breaker."""
+import asyncio
+
+import pytest
+
+from custom_components.denon_avr_3805.breaker import BREAKER_CLOSED
+from custom_components.denon_avr_3805.breaker import BREAKER_HALF_OPEN
+from custom_components.denon_avr_3805.breaker import BREAKER_OPEN
+from custom_components.denon_avr_3805.breaker import CircuitBreaker
+
+
+async def test_breaker_opens_after_threshold_and_probes_once():
+    """The breaker should reject calls while open and let one probe through afterwards."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow()
+
+    await asyncio.sleep(0.06)
+    assert breaker.state == BREAKER_HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one probe at a time
+
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.allow()
+
+
+async def test_breaker_backs_off_after_failed_probe():
+    """A failed probe should reopen the breaker with a longer timeout."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05, max_reset_timeout=0.15)
+    breaker.record_failure()
+    await asyncio.sleep(0.06)
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.reset_timeout == pytest.approx(0.1)
+
+    await asyncio.sleep(0.11)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.reset_timeout == pytest.approx(0.15)
+    assert breaker.get_diagnostics()["trips"] == 1
@@ -1,4 +1,6 @@
 """Test Denon AVR-3805 config flow."""
+from custom_components.denon_avr_3805.api import TRANSPORTS
+from custom_components.denon_avr_3805.config_flow import _async_test_connection
 from custom_components.denon_avr_3805.const import BINARY_SENSOR
 from custom_components.denon_avr_3805.const import CONF_HOST
 from custom_components.denon_avr_3805.const import CONF_MODEL
@@ -56,6 +58,21 @@ async def test_failed_config_flow(hass, error_on_connect):
     assert result["errors"] == {"base": "invalid_host"}
 
 
+async def test_connection_test_ignores_open_breaker_of_shared_client(fake_server):
+    """A shared client that gave up on the AVR should not fail a new connection test."""
+    shared = TRANSPORTS.acquire("127.0.0.1", fake_server.port)
+    shared._breaker.record_failure()
+    shared._breaker.record_failure()
+
+    try:
+        assert await _async_test_connection("127.0.0.1", fake_server.port) is True
+        assert fake_server.connections == 1
+        # The fresh client used for the test is not shared with anyone
+        assert TRANSPORTS.get("127.0.0.1", fake_server.port) is shared
+    finally:
+        await TRANSPORTS.async_release(shared)
+
+
 async def test_options_flow_shows_menu(hass, bypass_connect):
     """The options flow should start with a menu of what to configure."""
     entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, entry_id="test")
@@ -67,7 +84,7 @@ async def test_options_flow_shows_menu(hass, bypass_connect):
 
     assert result["type"] == data_entry_flow.FlowResultType.MENU
     assert result["step_id"] == "init"
-    assert set(result["menu_options"]) == {"connection", "platforms"}
+    assert set(result["menu_options"]) == {"connection", "platforms", "proxy"}
 
 
 async def test_options_flow_platforms(hass, bypass_connect):
@@ -1,5 +1,10 @@
 """Test Denon AVR-3805 setup process."""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
 from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
 
 import pytest
 from custom_components.denon_avr_3805 import (
@@ -9,10 +14,20 @@ from custom_components.denon_avr_3805 import (
     DenonAvr3805DataUpdateCoordinator,
 )
 from custom_components.denon_avr_3805.api import ConnectionStats
+from custom_components.denon_avr_3805.api import DenonAvr3805ApiClient
+from custom_components.denon_avr_3805.api import STATUS_QUERIES
 from custom_components.denon_avr_3805.const import (
+    COMMAND_TIMEOUT,
     DOMAIN,
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    SCENE_TIMEOUT,
+    STANDBY_POLL_INTERVAL,
 )
+from custom_components.denon_avr_3805.protocol import parse
+from custom_components.denon_avr_3805.state import AvrState
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
@@ -64,6 +79,14 @@ async def test_setup_entry_exception(hass, error_on_connect):
 def _mock_client(**overrides):
     """Build a mock API client returning healthy status responses by default."""
     client = AsyncMock()
+
+    @asynccontextmanager
+    async def session(timeout=None):
+        if not await client.connect_with_retry():
+            raise ConnectionError("Failed to connect")
+        yield client
+
+    client.session = MagicMock(side_effect=session)
     client.connect_with_retry = AsyncMock(return_value=True)
     client.async_get_power_status = AsyncMock(return_value="PWON")
     client.async_get_power_alt = AsyncMock(return_value="PWON")
@@ -71,9 +94,14 @@ def _mock_client(**overrides):
     client.async_get_volume_alt = AsyncMock(return_value="MV50")
     client.async_get_mute_status = AsyncMock(return_value="MUOFF")
     client.async_get_input = AsyncMock(return_value="SITV")
+    client.async_query_many = AsyncMock(
+        return_value={"power": "PWON", "volume": "MV50", "mute": "MUOFF", "input": "SITV"}
+    )
     client._send_command = AsyncMock(return_value=None)
+    client.add_listener = MagicMock()
     client.disconnect = AsyncMock()
     client.connection_stats = ConnectionStats()
+    client.settle_delay = 0
     for name, value in overrides.items():
         setattr(client, name, value)
     return client
@@ -85,12 +113,35 @@ async def test_coordinator_update_data_returns_status_fields(hass):
 
     data = await coordinator._async_update_data()
 
-    assert data == {
+    assert data.as_dict() == {
         "power": "PWON",
         "volume": "MV50",
         "mute": "MUOFF",
         "input": "SITV",
     }
+    assert data.power is True
+    assert data.volume == 50
+    assert data.muted is False
+    assert data.source == "TV"
+
+
+async def test_coordinator_update_data_falls_back_for_missing_answers(hass):
+    """Queries the AVR did not answer should be retried with the alternative commands."""
+    client = _mock_client(
+        async_query_many=AsyncMock(
+            return_value={"power": None, "volume": "MV50", "mute": None, "input": "SITV"}
+        ),
+        async_get_power_alt=AsyncMock(return_value="ZMON"),
+    )
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+
+    data = await coordinator._async_update_data()
+
+    client.async_get_power_alt.assert_awaited_once()
+    client.async_get_volume_alt.assert_not_awaited()
+    assert data.as_dict() == {"power": "ZMON", "volume": "MV50", "mute": None, "input": "SITV"}
+    assert data.power is True
+    assert data.muted is None
 
 
 async def test_coordinator_update_data_raises_update_failed_when_unreachable(hass):
@@ -102,40 +153,404 @@ async def test_coordinator_update_data_raises_update_failed_when_unreachable(has
         await coordinator._async_update_data()
 
 
-async def test_execute_and_refresh_field_confirms_immediately(hass):
-    """A confirmed status should be pushed to entities without a full poll."""
+async def test_execute_and_refresh_field_confirms_with_echo(hass):
+    """The echo of a command should be pushed to entities without a query or a poll."""
+    client = _mock_client()
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState({"power": "PWON", "volume": "MV50", "mute": "MUON", "input": "SITV"})
+
+    command = AsyncMock(return_value="MUOFF")
+    query = AsyncMock()
+
+    await coordinator.async_execute_and_refresh_field(command, "mute", query)
+    await hass.async_block_till_done()
+
+    client.session.assert_called_once()
+    command.assert_awaited_once()
+    assert command.await_args.kwargs["confirm"] is True
+    # Sending and confirming the command share one overall timeout
+    assert 0 < command.await_args.kwargs["timeout"] <= COMMAND_TIMEOUT
+    query.assert_not_awaited()
+    assert coordinator.data.muted is False
+    # Unrelated fields are preserved.
+    assert coordinator.data.power is True
+
+
+async def test_execute_and_refresh_field_queries_without_echo(hass):
+    """Without an echo the field should be queried on the same connection."""
     client = _mock_client()
     coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
-    coordinator.data = {"power": "PWON", "volume": "MV50", "mute": "MUON", "input": "SITV"}
+    coordinator.data = AvrState({"power": "PWON", "volume": "MV50", "mute": "MUON", "input": "SITV"})
 
-    command = AsyncMock()
     query = AsyncMock(return_value="MUOFF")
 
     await coordinator.async_execute_and_refresh_field(
-        command, "mute", query, settle_delay=0
+        AsyncMock(return_value=None), "mute", query
     )
+    await hass.async_block_till_done()
 
-    client.connect.assert_awaited_once()
-    command.assert_awaited_once()
     query.assert_awaited_once()
-    client.disconnect.assert_awaited_once()
-    assert coordinator.data["mute"] == "MUOFF"
-    # Unrelated fields are preserved.
-    assert coordinator.data["power"] == "PWON"
+    assert coordinator.data.muted is False
+
+
+async def test_execute_and_refresh_field_applies_expected_state_at_once(hass):
+    """The expected state should be shown before the command is confirmed."""
+    client = _mock_client()
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState({"power": "PWON", "volume": "MV50"}, {"volume": 1.0})
+
+    await coordinator.async_execute_and_refresh_field(
+        AsyncMock(return_value="MV45"), "volume", AsyncMock(), expected="MV45"
+    )
 
+    assert coordinator.data.volume == 45
+    # Not reported by the AVR yet, so not stamped
+    assert coordinator.data.updated["volume"] == 1.0
 
-async def test_execute_and_refresh_field_falls_back_to_full_refresh(hass):
-    """If the confirmation query fails, fall back to requesting a full refresh."""
+    await hass.async_block_till_done()
+    assert coordinator.data.volume == 45
+    assert coordinator.data.updated["volume"] > 1.0
+
+
+async def test_execute_and_refresh_field_takes_the_avr_value(hass):
+    """If the AVR reports another state than expected, its value should win."""
     client = _mock_client()
     coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
-    coordinator.data = {"mute": "MUON"}
-    coordinator.async_request_refresh = AsyncMock()
+    coordinator.data = AvrState({"power": "PWON", "input": "SITV"})
 
     await coordinator.async_execute_and_refresh_field(
-        AsyncMock(), "mute", AsyncMock(return_value=None), settle_delay=0
+        AsyncMock(return_value="SICD"), "input", AsyncMock(), expected="SIDVD"
+    )
+    assert coordinator.data.source == "DVD"
+
+    await hass.async_block_till_done()
+    assert coordinator.data.source == "CD"
+
+
+async def test_execute_and_refresh_field_rolls_back_unconfirmed_command(hass):
+    """If nothing confirms the command, undo the optimistic state and query the field again."""
+    client = _mock_client()
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState({"mute": "MUON"})
+    coordinator.async_request_field_refresh = AsyncMock()
+
+    await coordinator.async_execute_and_refresh_field(
+        AsyncMock(side_effect=ConnectionError("unreachable")),
+        "mute",
+        AsyncMock(return_value=None),
+        expected="MUOFF",
+    )
+    assert coordinator.data.muted is False
+
+    await hass.async_block_till_done()
+    coordinator.async_request_field_refresh.assert_awaited_once_with("mute")
+    assert coordinator.data.get("mute") == "MUON"
+
+
+async def test_execute_and_refresh_field_latest_command_wins(hass):
+    """Only the latest command for a field should reconcile it."""
+    client = _mock_client()
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState({"power": "PWON", "volume": "MV50"})
+
+    await coordinator.async_execute_and_refresh_field(
+        AsyncMock(return_value="MV51"), "volume", AsyncMock(), expected="MV51"
+    )
+    await coordinator.async_execute_and_refresh_field(
+        AsyncMock(return_value="MV52"), "volume", AsyncMock(), expected="MV52"
+    )
+    await hass.async_block_till_done()
+
+    assert coordinator.data.volume == 52
+
+
+async def test_execute_and_refresh_field_skips_query_for_superseded_command(hass):
+    """A command coalesced away by a newer one should not query the field itself."""
+    client = _mock_client()
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState({"power": "PWON", "volume": "MV50"})
+    superseded = asyncio.Event()
+
+    async def first_command(timeout, confirm):
+        await superseded.wait()
+        return None
+
+    first_query = AsyncMock(return_value="MV51")
+    await coordinator.async_execute_and_refresh_field(
+        first_command, "volume", first_query, expected="MV51"
+    )
+    await asyncio.sleep(0)
+    await coordinator.async_execute_and_refresh_field(
+        AsyncMock(return_value="MV52"), "volume", AsyncMock(), expected="MV52"
+    )
+    superseded.set()
+    await hass.async_block_till_done()
+
+    first_query.assert_not_awaited()
+    assert coordinator.data.volume == 52
+
+
+async def test_field_refresh_merges_requests(hass):
+    """Field refreshes requested close together should be sent as one batch."""
+    client = _mock_client()
+    client.async_query_many = AsyncMock(return_value={"input": "SIDVD", "mute": "MUON"})
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState({"power": "PWON", "mute": "MUOFF", "input": "SITV"})
+
+    await coordinator.async_request_field_refresh("input")
+    await coordinator.async_request_field_refresh("mute", "input")
+    await coordinator._async_refresh_fields()
+
+    client.async_query_many.assert_awaited_once()
+    queried = [query[0] for query in client.async_query_many.await_args.args[0]]
+    assert queried == ["mute", "input"]
+    assert coordinator.data.source == "DVD"
+    assert coordinator.data.muted is True
+    coordinator._field_refresh_debouncer.async_cancel()
+
+
+async def test_field_refresh_skips_fresh_fields(hass):
+    """Fields the AVR reported since the request (or within max_age) should not be queried."""
+    client = _mock_client()
+    client.async_query_many = AsyncMock(return_value={"volume": "MV40"})
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState({"power": "PWON", "volume": "MV50"}).update(
+        {"power": "PWON"}, now=time.monotonic() - 5
+    )
+
+    await coordinator.async_request_field_refresh("power", max_age=10)
+    await coordinator.async_request_field_refresh("volume", "input")
+    # Pushed by the AVR before the batch went out
+    coordinator._async_handle_push(parse(b"SIDVD\r"))
+    await coordinator._async_refresh_fields()
+
+    queried = [query[0] for query in client.async_query_many.await_args.args[0]]
+    assert queried == ["volume"]
+    assert coordinator.data.volume == 40
+    coordinator._field_refresh_debouncer.async_cancel()
+
+
+async def test_apply_scene_applies_verified_state(hass):
+    """A scene should run in one session and apply what the AVR reports at the end."""
+    client = _mock_client()
+    client.async_apply = AsyncMock(return_value={"input": "SIDVD", "volume": None})
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState().update({"power": "PWON", "volume": "MV50", "input": "SITV"})
+    coordinator.async_request_field_refresh = AsyncMock()
+
+    await coordinator.async_apply_scene([("input", "DVD"), ("volume", 40)])
+
+    client.session.assert_called_once()
+    steps, current = client.async_apply.await_args.args
+    assert steps == [("input", "DVD"), ("volume", 40)]
+    assert current["input"] == "SITV"
+    assert 0 < client.async_apply.await_args.kwargs["timeout"] <= SCENE_TIMEOUT
+    assert coordinator.data.source == "DVD"
+    coordinator.async_request_field_refresh.assert_awaited_once_with("volume")
+
+
+async def test_apply_scene_ignores_unconfirmed_values(hass):
+    """A value shown optimistically should not make the scene skip its step."""
+    client = _mock_client()
+    client.async_apply = AsyncMock(return_value={"input": "SIDVD"})
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState().update({"power": "PWON", "input": "SITV"}).assume(
+        "input", "SIDVD"
+    )
+
+    await coordinator.async_apply_scene([("input", "DVD")])
+
+    _, current = client.async_apply.await_args.args
+    assert current == {"power": "PWON"}
+
+
+async def test_apply_scene_returns_within_timeout(hass, fake_server):
+    """A scene should not outlast its timeout when the AVR does not answer."""
+    fake_server.delays = {command: 10 for command in ("PW?", "MV?", "MU?", "SI?", "MS?")}
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState({"power": "PWON", "volume": "MV50"})
+    coordinator.async_request_field_refresh = AsyncMock()
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await coordinator.async_apply_scene([("volume", 40), ("mute", True)], timeout=0.5)
+    assert loop.time() - start < 1.0
+
+    assert fake_server.received[:2] == ["MV40", "MUON"]
+    coordinator.async_request_field_refresh.assert_awaited_once()
+    await client.async_close()
+
+
+async def test_apply_scene_fails_when_avr_unreachable(hass, socket_enabled):
+    """An unreachable AVR should fail the scene within its timeout, not after every retry."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", 1, config={"max_retries": 3, "retry_delay": 1.0}
     )
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.async_request_field_refresh = AsyncMock()
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    with pytest.raises(HomeAssistantError):
+        await coordinator.async_apply_scene([("power", True)], timeout=0.5)
+    assert loop.time() - start < 1.0
+    coordinator.async_request_field_refresh.assert_awaited_once_with("power")
+
+
+async def test_push_update_applies_changed_field(hass):
+    """An unsolicited status line from the AVR should update only its field."""
+    client = _mock_client()
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState({"power": "PWON", "volume": "MV50", "mute": "MUOFF", "input": "SITV"})
+
+    client.add_listener.assert_called_once_with(coordinator._async_handle_push)
+
+    coordinator._async_handle_push(parse(b"MV45\r"))
+    coordinator._async_handle_push(parse(b"SIDVD\r"))
+
+    assert coordinator.data.volume == 45
+    assert coordinator.data.source == "DVD"
+    assert coordinator.data.as_dict() == {
+        "power": "PWON",
+        "volume": "MV45",
+        "mute": "MUOFF",
+        "input": "SIDVD",
+    }
+
+
+async def test_push_update_ignores_unrelated_lines(hass):
+    """Lines that are not plain status values should leave the data untouched."""
+    client = _mock_client()
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    coordinator.data = AvrState({"power": "PWON", "volume": "MV50", "mute": "MUOFF", "input": "SITV"})
+    coordinator.async_set_updated_data = MagicMock()
+
+    coordinator._async_handle_push(parse(b"MVMAX 98\r"))
+    coordinator._async_handle_push(parse(b"Z2ON\r"))
+    coordinator._async_handle_push(parse(b"PWON\r"))
+
+    coordinator.async_set_updated_data.assert_not_called()
 
-    coordinator.async_request_refresh.assert_awaited_once()
-    # Data is left untouched since the value couldn't be confirmed.
-    assert coordinator.data["mute"] == "MUON"
 
+async def test_unchanged_poll_reports_no_changed_fields(hass):
+    """A poll that returns the current status should not mark any field as changed."""
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=_mock_client())
+
+    await coordinator.async_refresh()
+    assert coordinator.changed_fields == {"power", "volume", "mute", "input"}
+    assert coordinator.availability_changed
+
+    coordinator.async_update_listeners()
+    assert coordinator.changed_fields == frozenset()
+    assert not coordinator.availability_changed
+
+    coordinator._async_handle_push(parse(b"MUON\r"))
+    assert coordinator.changed_fields == {"mute"}
+
+
+async def test_poll_plan_queries_only_due_fields(hass):
+    """Scheduled polls should batch only the fields whose interval has passed."""
+    client = _mock_client()
+    coordinator = DenonAvr3805DataUpdateCoordinator(
+        hass,
+        client=client,
+        poll_plan={"power": timedelta(seconds=10), "input": timedelta(minutes=2)},
+    )
+    assert coordinator.update_interval == timedelta(seconds=10)
+
+    now = time.monotonic()
+    coordinator._poll_all = False
+    coordinator.data = AvrState().update({"power": "PWON", "input": "SITV"}, now=now - 10)
+    assert [name for name, _, _ in coordinator._due_queries(now)] == ["power"]
+
+    coordinator.data = coordinator.data.update({"power": "PWON"}, now=now - 120)
+    coordinator.data = coordinator.data.update({"input": "SITV"}, now=now - 120)
+    assert [name for name, _, _ in coordinator._due_queries(now)] == ["power", "input"]
+
+    # A pushed update resets the field's timer
+    coordinator.data = coordinator.data.update({"power": "PWON"}, now=now)
+    assert [name for name, _, _ in coordinator._due_queries(now)] == ["input"]
+
+
+async def test_requested_refresh_polls_every_field(hass):
+    """A refresh requested after a command should query the full status."""
+    client = _mock_client()
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    await coordinator.async_refresh()
+    client.async_query_many.assert_awaited_once_with(STATUS_QUERIES)
+
+    client.async_query_many.reset_mock()
+    await coordinator.async_refresh()
+    client.async_query_many.assert_not_awaited()
+
+    client.async_query_many.reset_mock()
+    await coordinator.async_request_refresh()
+    await hass.async_block_till_done()
+    client.async_query_many.assert_awaited_once_with(STATUS_QUERIES)
+
+
+async def test_standby_polls_only_power_at_slow_interval(hass):
+    """In standby only power should be polled, and slowly."""
+    client = _mock_client(
+        async_query_many=AsyncMock(
+            return_value={"power": "PWSTANDBY", "volume": None, "mute": None, "input": None}
+        ),
+    )
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+
+    await coordinator.async_refresh()
+
+    assert coordinator.in_standby
+    assert coordinator.update_interval == STANDBY_POLL_INTERVAL
+    now = time.monotonic() + STANDBY_POLL_INTERVAL.total_seconds()
+    assert [name for name, _, _ in coordinator._due_queries(now)] == ["power"]
+
+
+async def test_power_on_push_resumes_full_polling(hass):
+    """A pushed power-on should leave standby and poll every field on the next cycle."""
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=_mock_client())
+    coordinator.data = AvrState().update({"power": "PWSTANDBY"})
+    coordinator._poll_all = False
+    coordinator.update_interval = STANDBY_POLL_INTERVAL
+
+    coordinator._async_handle_push(parse(b"PWON\r"))
+
+    assert not coordinator.in_standby
+    assert coordinator.update_interval == MIN_POLL_INTERVAL
+    assert coordinator._due_queries(time.monotonic()) == STATUS_QUERIES
+
+
+async def test_poll_interval_follows_activity(hass):
+    """Changes should speed polling up, quiet polls should back it off to the maximum."""
+    client = _mock_client()
+    coordinator = DenonAvr3805DataUpdateCoordinator(hass, client=client)
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == MIN_POLL_INTERVAL
+
+    # Every quiet cycle doubles the interval, up to the configured maximum
+    coordinator._update_poll_mode(coordinator.data)
+    assert coordinator.update_interval == MIN_POLL_INTERVAL * 2
+    for _ in range(10):
+        coordinator._update_poll_mode(coordinator.data)
+    assert coordinator.update_interval == MAX_POLL_INTERVAL
+
+    coordinator._async_handle_push(parse(b"MV45\r"))
+    assert coordinator.update_interval == MIN_POLL_INTERVAL
+
+
+async def test_fast_polling_scales_the_poll_plan(hass):
+    """While active, each field should be polled proportionally faster."""
+    coordinator = DenonAvr3805DataUpdateCoordinator(
+        hass,
+        client=_mock_client(),
+        poll_plan={"power": timedelta(seconds=30), "input": timedelta(minutes=5)},
+        min_interval=timedelta(seconds=3),
+    )
+    now = time.monotonic()
+    coordinator._poll_all = False
+    coordinator.data = AvrState().update({"power": "PWON", "input": "SITV"}, now=now - 4)
+    coordinator.update_interval = timedelta(seconds=3)
+
+    assert [name for name, _, _ in coordinator._due_queries(now)] == ["power"]
+    assert [name for name, _, _ in coordinator._due_queries(now + 30)] == ["power", "input"]
@@ -0,0 +1,86 @@
+"""Tests for the Denon AVR-3805 protocol parser and encoder."""
+import pytest
+
+from custom_components.denon_avr_3805.protocol import Event
+from custom_components.denon_avr_3805.protocol import MasterVolume
+from custom_components.denon_avr_3805.protocol import Mute
+from custom_components.denon_avr_3805.protocol import Power
+from custom_components.denon_avr_3805.protocol import Source
+from custom_components.denon_avr_3805.protocol import SurroundMode
+from custom_components.denon_avr_3805.protocol import Zone
+from custom_components.denon_avr_3805.protocol import encode
+from custom_components.denon_avr_3805.protocol import encode_source
+from custom_components.denon_avr_3805.protocol import encode_volume
+from custom_components.denon_avr_3805.protocol import parse
+from custom_components.denon_avr_3805.protocol import parse_text
+
+
+@pytest.mark.parametrize(
+    ("line", "event_type", "attribute", "value"),
+    [
+        (b"PWON\r", Power, "on", True),
+        (b"PWSTANDBY\r", Power, "on", False),
+        (b"MV45\r", MasterVolume, "level", 45.0),
+        (b"MV505\r", MasterVolume, "level", 50.5),
+        (b"MV00\r", MasterVolume, "level", 0.0),
+        (b"MUON\r", Mute, "muted", True),
+        (b"MUOFF\r", Mute, "muted", False),
+        (b"SIDVD\r", Source, "source", "DVD"),
+        (b"SICBL/SAT\r", Source, "source", "CBL/SAT"),
+        (b"MSDOLBY DIGITAL\r", SurroundMode, "mode", "DOLBY DIGITAL"),
+        (b"ZMON\r", Zone, "on", True),
+        (b"ZM ON\r", Zone, "on", True),
+        (b"Z2DVD\r", Zone, "value", "DVD"),
+    ],
+)
+def test_parse_known_status_lines(line, event_type, attribute, value):
+    """Known status lines should parse into their typed event."""
+    event = parse(line)
+
+    assert type(event) is event_type
+    assert getattr(event, attribute) == value
+    assert event.raw == line.strip().decode()
+
+
+@pytest.mark.parametrize("line", [b"MVMAX 98\r", b"MV99\r", b"MV507\r", b"PWMAYBE\r", b"XX\r"])
+def test_parse_unknown_lines_as_plain_events(line):
+    """Lines that are not a valid status value should come back as a plain Event."""
+    event = parse(line)
+
+    assert type(event) is Event
+    assert event.raw == line.strip().decode()
+
+
+def test_parse_empty_line():
+    """An empty line (e.g. a stray CR) should not produce an event."""
+    assert parse(b"\r") is None
+    assert parse_text(None) is None
+
+
+def test_events_use_slots():
+    """Events are created for every received line and should stay small."""
+    assert not hasattr(parse(b"MV45"), "__dict__")
+
+
+@pytest.mark.parametrize(
+    ("level", "expected"),
+    [(0, b"MV00\r"), (45, b"MV45\r"), (50.5, b"MV505\r"), (98, b"MV98\r"), (45.3, b"MV455\r")],
+)
+def test_encode_volume(level, expected):
+    """Volume levels should be encoded as whole or half steps."""
+    assert encode_volume(level) == expected
+
+
+@pytest.mark.parametrize("level", [-1, 98.5, 99])
+def test_encode_volume_out_of_range(level):
+    """Levels outside of the 0-98 scale should be rejected."""
+    with pytest.raises(ValueError):
+        encode_volume(level)
+
+
+def test_encode_commands():
+    """Commands should be encoded with their trailing CR."""
+    assert encode("PWON") == b"PWON\r"
+    assert encode("MU?") == b"MU?\r"
+    assert encode("SIDVD") is encode_source("DVD")
+    assert encode_source("NEW") == b"SINEW\r"
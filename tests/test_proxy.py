@@ -0,0 +1,118 @@
+"""Tests for the Denon AVR-3805 sharing proxy."""
+import asyncio
+
+from custom_components.denon_avr_3805.api import DenonAvr3805ApiClient
+from custom_components.denon_avr_3805.proxy import FanOutProxy
+from custom_components.denon_avr_3805.scheduler import PRIORITY_INTERACTIVE
+
+
+async def _open_proxy_client(proxy):
+    reader, writer = await asyncio.open_connection("127.0.0.1", proxy.port)
+    # Give the proxy a moment to register the client
+    await asyncio.sleep(0.05)
+    return reader, writer
+
+
+async def test_proxy_forwards_commands_and_shares_replies(fake_server):
+    """A command from one proxy client should reach the AVR and its reply every client."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+    proxy = FanOutProxy(client, 0, host="127.0.0.1")
+    await proxy.async_start()
+
+    reader1, writer1 = await _open_proxy_client(proxy)
+    reader2, writer2 = await _open_proxy_client(proxy)
+    assert proxy.clients == 2
+
+    writer1.write(b"PW?\r")
+    await writer1.drain()
+
+    assert await asyncio.wait_for(reader1.readuntil(b"\r"), 1) == b"PWON\r"
+    assert await asyncio.wait_for(reader2.readuntil(b"\r"), 1) == b"PWON\r"
+    assert "PW?" in fake_server.received
+    assert proxy.forwarded_commands == 1
+
+    # Lines the AVR sends on its own are shared as well
+    await fake_server.push("MV45")
+    assert await asyncio.wait_for(reader1.readuntil(b"\r"), 1) == b"MV45\r"
+    assert await asyncio.wait_for(reader2.readuntil(b"\r"), 1) == b"MV45\r"
+
+    writer1.close()
+    writer2.close()
+    await proxy.async_stop()
+    await client.disconnect()
+
+
+async def test_proxy_query_does_not_supersede_queued_set(fake_server):
+    """A query from a proxy client should neither drop a queued input change nor the cache."""
+    client = DenonAvr3805ApiClient(
+        "127.0.0.1", fake_server.port, config={"cache_ttl": 5.0}
+    )
+    await client.connect()
+    assert await client.async_get_power_status() == "PWON"
+    proxy = FanOutProxy(client, 0)
+    # Proxy clients are not authenticated, so only local ones by default
+    assert proxy.host == "127.0.0.1"
+    await proxy.async_start()
+    _, writer = await _open_proxy_client(proxy)
+
+    async with client._scheduler.slot(PRIORITY_INTERACTIVE):
+        # Both wait for the link behind whatever holds it
+        select = asyncio.ensure_future(client.async_select_input("DVD"))
+        await asyncio.sleep(0.01)
+        writer.write(b"SI?\rPW?\r")
+        await writer.drain()
+        await asyncio.sleep(0.05)
+
+    await select
+    await asyncio.sleep(0.2)
+    assert "SIDVD" in fake_server.received
+    assert client.connection_stats.coalesced_commands == 0
+
+    # The cached power status survived the forwarded PW?
+    assert await client.async_get_power_status() == "PWON"
+    assert fake_server.received.count("PW?") == 2
+
+    writer.close()
+    await proxy.async_stop()
+    await client.disconnect()
+
+
+async def test_proxy_rejects_clients_over_limit(fake_server):
+    """Clients beyond max_clients should be disconnected straight away."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+    proxy = FanOutProxy(client, 0, host="127.0.0.1", max_clients=1)
+    await proxy.async_start()
+
+    _, writer1 = await _open_proxy_client(proxy)
+    reader2, writer2 = await _open_proxy_client(proxy)
+
+    assert await asyncio.wait_for(reader2.read(), 1) == b""
+    assert proxy.clients == 1
+
+    writer1.close()
+    writer2.close()
+    await proxy.async_stop()
+    await client.disconnect()
+    assert proxy.get_diagnostics()["clients"] == 0
+
+
+async def test_proxy_ignores_garbage(fake_server):
+    """Oversized and non-ASCII lines should not be forwarded to the AVR."""
+    client = DenonAvr3805ApiClient("127.0.0.1", fake_server.port)
+    await client.connect()
+    proxy = FanOutProxy(client, 0, host="127.0.0.1")
+    await proxy.async_start()
+
+    _, writer = await _open_proxy_client(proxy)
+    writer.write(b"X" * 100 + b"\r" + b"\xff\xfe\r" + b"\r\n")
+    await writer.drain()
+    await asyncio.sleep(0.1)
+
+    assert proxy.forwarded_commands == 0
+    assert fake_server.received == []
+
+    writer.close()
+    await proxy.async_stop()
+    await client.disconnect()
@@ -0,0 +1,170 @@
+"""Tests for the Denon AVR-3805 command scheduler."""
+import asyncio
+
+import pytest
+
+from custom_components.denon_avr_3805.scheduler import AdaptivePacer
+from custom_components.denon_avr_3805.scheduler import CommandQueueFullError
+from custom_components.denon_avr_3805.scheduler import CommandScheduler
+from custom_components.denon_avr_3805.scheduler import LinkThrottle
+from custom_components.denon_avr_3805.scheduler import PRIORITY_BACKGROUND
+from custom_components.denon_avr_3805.scheduler import PRIORITY_INTERACTIVE
+
+
+async def _run(scheduler, priority, name, order, hold=0.01):
+    """Take a slot, record the order it was granted in and hold it briefly."""
+    async with scheduler.slot(priority):
+        order.append(name)
+        await asyncio.sleep(hold)
+
+
+async def test_interactive_commands_go_ahead_of_background():
+    """A user command queued after background queries should be served first."""
+    scheduler = CommandScheduler()
+    order = []
+
+    tasks = [
+        asyncio.ensure_future(_run(scheduler, PRIORITY_BACKGROUND, "poll-1", order)),
+        asyncio.ensure_future(_run(scheduler, PRIORITY_BACKGROUND, "poll-2", order)),
+        asyncio.ensure_future(_run(scheduler, PRIORITY_BACKGROUND, "poll-3", order)),
+    ]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.ensure_future(_run(scheduler, PRIORITY_INTERACTIVE, "mute", order)))
+    await asyncio.gather(*tasks)
+
+    assert order == ["poll-1", "mute", "poll-2", "poll-3"]
+    assert scheduler.stats[PRIORITY_INTERACTIVE].scheduled == 1
+    assert scheduler.stats[PRIORITY_BACKGROUND].scheduled == 3
+    assert scheduler.stats[PRIORITY_INTERACTIVE].max_wait > 0
+
+
+async def test_queue_depth_is_bounded():
+    """Commands beyond the queue depth should be rejected right away."""
+    scheduler = CommandScheduler(max_queue_depth=1)
+    order = []
+
+    holder = asyncio.ensure_future(_run(scheduler, PRIORITY_BACKGROUND, "first", order, 0.05))
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(_run(scheduler, PRIORITY_BACKGROUND, "second", order))
+    await asyncio.sleep(0)
+
+    with pytest.raises(CommandQueueFullError):
+        await _run(scheduler, PRIORITY_BACKGROUND, "third", order)
+
+    await asyncio.gather(holder, waiter)
+    assert order == ["first", "second"]
+    assert scheduler.stats[PRIORITY_BACKGROUND].rejected == 1
+
+
+async def test_wait_times_out_per_priority_class():
+    """A command waiting longer than its class timeout should give up without blocking others."""
+    scheduler = CommandScheduler(timeouts={PRIORITY_BACKGROUND: 0.01})
+    order = []
+
+    holder = asyncio.ensure_future(_run(scheduler, PRIORITY_INTERACTIVE, "user", order, 0.05))
+    await asyncio.sleep(0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await _run(scheduler, PRIORITY_BACKGROUND, "poll", order)
+
+    await holder
+    await _run(scheduler, PRIORITY_BACKGROUND, "later", order)
+    assert order == ["user", "later"]
+    assert scheduler.stats[PRIORITY_BACKGROUND].timed_out == 1
+    assert scheduler.queued == 0
+
+
+async def test_wait_is_capped_by_caller_timeout():
+    """A caller's own timeout should apply when it is shorter than the class timeout."""
+    scheduler = CommandScheduler(timeouts={PRIORITY_INTERACTIVE: 5.0})
+
+    async with scheduler.slot(PRIORITY_BACKGROUND):
+        with pytest.raises(asyncio.TimeoutError):
+            async with scheduler.slot(PRIORITY_INTERACTIVE, timeout=0.02):
+                pass
+
+    assert scheduler.stats[PRIORITY_INTERACTIVE].timed_out == 1
+
+
+def test_pacer_uses_initial_delays_until_measured():
+    """Before any response has been timed, the configured delays should apply."""
+    pacer = AdaptivePacer(command_gap=0.1, settle_delay=0.3)
+
+    assert pacer.command_gap == 0.1
+    assert pacer.settle_delay == 0.3
+
+
+def test_pacer_speeds_up_for_a_responsive_avr():
+    """Fast round trips should shrink the delays down to their lower bounds."""
+    pacer = AdaptivePacer(min_command_gap=0.02, min_settle_delay=0.05)
+    for _ in range(10):
+        pacer.record_response(0.01)
+
+    assert pacer.command_gap == 0.02
+    assert pacer.settle_delay == 0.05
+
+
+def test_pacer_backs_off_on_slow_responses_and_failures():
+    """Slow answers and timeouts should stretch the delays up to their upper bounds."""
+    pacer = AdaptivePacer(max_command_gap=0.5, max_settle_delay=1.0)
+    pacer.record_response(0.2)
+    gap_before_failures = pacer.command_gap
+    assert gap_before_failures == pytest.approx(0.1)
+
+    for _ in range(5):
+        pacer.record_failure()
+
+    assert pacer.command_gap > gap_before_failures
+    assert pacer.settle_delay == 1.0
+    assert pacer.get_diagnostics()["failures"] == 5
+
+
+async def test_pacer_spaces_writes_by_the_command_gap():
+    """Consecutive writes should be at least the command gap apart."""
+    pacer = AdaptivePacer(command_gap=0.05)
+    loop = asyncio.get_running_loop()
+
+    await pacer.wait_for_gap()
+    start = loop.time()
+    await pacer.wait_for_gap()
+
+    assert loop.time() - start >= 0.045
+
+
+def test_throttle_cost_counts_bytes_and_commands():
+    """A write should cost its transmission time plus the processing time per command."""
+    throttle = LinkThrottle(baud_rate=9600, command_cost=0.05)
+
+    # 5 bytes at 960 bytes per second, plus one command
+    assert throttle.cost(b"PWON\r") == pytest.approx(5 / 960 + 0.05)
+    assert throttle.cost(b"PW?\rMV?\r") == pytest.approx(8 / 960 + 0.1)
+
+
+async def test_throttle_holds_writes_until_the_link_is_free():
+    """A write should wait until the previous one has been sent and processed."""
+    throttle = LinkThrottle(baud_rate=9600, command_cost=0.05)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await throttle.acquire(b"PW?\r")
+    assert loop.time() - start < 0.01
+    await throttle.acquire(b"MV?\r")
+
+    assert loop.time() - start >= throttle.cost(b"PW?\r") - 0.005
+    assert throttle.get_diagnostics()["throttled"] == 1
+    assert throttle.get_diagnostics()["commands_sent"] == 2
+
+
+async def test_throttle_burst_and_timeout():
+    """Writes within the burst should go straight out, a wait past the timeout should fail."""
+    throttle = LinkThrottle(command_cost=0.05, burst=0.2)
+
+    for _ in range(3):
+        await throttle.acquire(b"MU?\r")
+    assert throttle.throttled == 0
+
+    await throttle.acquire(b"MU?\r")
+    with pytest.raises(asyncio.TimeoutError):
+        await throttle.acquire(b"MU?\r", timeout=0.001)
+    assert throttle.commands_sent == 4
+
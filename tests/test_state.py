@@ -0,0 +1,103 @@
+"""Tests for the parsed AVR state model."""
+import pytest
+from custom_components.denon_avr_3805.state import AvrState
+
+
+def test_state_parses_fields_once():
+    """Typed attributes should be parsed from the raw responses."""
+    state = AvrState({
+        "power": "PWON",
+        "volume": "MV505",
+        "mute": "MUON",
+        "input": "SIDVD",
+        "surround": "MSDOLBY DIGITAL",
+    })
+
+    assert state.power is True
+    assert state.volume == 50.5
+    assert state.muted is True
+    assert state.source == "DVD"
+    assert state.surround == "DOLBY DIGITAL"
+    assert state.has_status
+
+
+def test_state_whole_volume_steps_are_integers():
+    """Whole volume steps should be reported as integers."""
+    state = AvrState({"volume": "MV45"})
+
+    assert state.volume == 45
+    assert isinstance(state.volume, int)
+
+
+def test_state_main_zone_answer_counts_as_power():
+    """The ZMON/ZMOFF answer of the alternative power query should set power."""
+    assert AvrState({"power": "ZMON"}).power is True
+    assert AvrState({"power": "ZMOFF"}).power is False
+
+
+def test_state_missing_or_garbled_fields_are_none():
+    """Fields without a usable response should be None."""
+    state = AvrState({"power": None, "volume": "MV?", "mute": "MUXX"})
+
+    assert state.power is None
+    assert state.volume is None
+    assert state.muted is None
+    assert state.source is None
+    assert state.get("volume") == "MV?"
+    assert not AvrState().has_status
+
+
+def test_state_update_returns_new_state():
+    """Updating should leave the original untouched and stamp the answered fields."""
+    state = AvrState({"power": "PWON", "mute": "MUOFF"})
+
+    updated = state.update({"mute": "MUON", "input": None}, now=12.0)
+
+    assert state.muted is False
+    assert updated.muted is True
+    assert updated.power is True
+    assert updated.updated == {"mute": 12.0}
+    assert updated != state
+    assert updated == AvrState({"power": "PWON", "mute": "MUON", "input": None})
+
+
+def test_state_assume_keeps_timestamps():
+    """An assumed value should replace the field without marking it as reported."""
+    state = AvrState({"mute": "MUOFF"}, {"mute": 5.0})
+
+    assumed = state.assume("mute", "MUON")
+
+    assert assumed.muted is True
+    assert assumed.updated == {"mute": 5.0}
+    assert state.muted is False
+
+
+def test_state_confirmed_leaves_out_assumed_values():
+    """Only values the AVR reported should count as confirmed."""
+    state = AvrState({"power": "PWON"}).update({"mute": "MUOFF", "input": "SITV"}, now=5.0)
+
+    assumed = state.assume("mute", "MUON")
+
+    assert assumed.assumed == {"mute"}
+    assert assumed.confirmed == {"input": "SITV"}
+    assert assumed.update({"mute": "MUON"}).confirmed == {"mute": "MUON", "input": "SITV"}
+
+
+def test_state_matches_compares_parsed_values():
+    """A status line should match a field holding the same state, however it was reported."""
+    state = AvrState({"power": "ZMON", "volume": "MV405"})
+
+    assert state.matches("power", "PWON")
+    assert not state.matches("power", "PWSTANDBY")
+    assert state.matches("volume", "MV405")
+    assert not state.matches("mute", "MUOFF")
+
+
+def test_state_is_immutable():
+    """Attributes cannot be reassigned."""
+    state = AvrState({"power": "PWON"})
+
+    with pytest.raises(AttributeError):
+        state.power = False
+    with pytest.raises(TypeError):
+        state.raw["power"] = "PWSTANDBY"
@@ -1,7 +1,9 @@
 """Test Denon AVR-3805 switches."""
 from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
 
 from custom_components.denon_avr_3805.const import DOMAIN
+from custom_components.denon_avr_3805.switch import DenonAvr3805MuteSwitch
 from homeassistant.components.switch import SERVICE_TURN_OFF
 from homeassistant.components.switch import SERVICE_TURN_ON
 from homeassistant.const import ATTR_ENTITY_ID
@@ -51,18 +53,25 @@ async def test_power_switch_turn_on_off(hass, bypass_connect):
     config_entry = await _setup_entry(hass)
     entity_id = _entity_id(hass, config_entry, "power")
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator.api.async_power_on = AsyncMock()
-    coordinator.api.async_power_off = AsyncMock()
+    coordinator.api.async_power_on = AsyncMock(return_value="PWON")
+    coordinator.api.async_power_off = AsyncMock(return_value="PWSTANDBY")
 
     await hass.services.async_call(
         "switch", SERVICE_TURN_OFF, {ATTR_ENTITY_ID: entity_id}, blocking=True
     )
+    # Shown right away, before the command is confirmed
+    assert hass.states.get(entity_id).state == "off"
+    await hass.async_block_till_done()
     coordinator.api.async_power_off.assert_awaited_once()
+    assert coordinator.api.async_power_off.await_args.kwargs["confirm"] is True
 
     await hass.services.async_call(
         "switch", SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True
     )
+    await hass.async_block_till_done()
     coordinator.api.async_power_on.assert_awaited_once()
+    assert coordinator.api.async_power_on.await_args.kwargs["confirm"] is True
+    assert hass.states.get(entity_id).state == "on"
 
 
 async def test_mute_switch_turn_on_updates_state_immediately(hass, bypass_connect):
@@ -76,7 +85,7 @@ async def test_mute_switch_turn_on_updates_state_immediately(hass, bypass_connec
     entity_id = _entity_id(hass, config_entry, "mute")
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    coordinator.api.async_mute_on = AsyncMock()
+    coordinator.api.async_mute_on = AsyncMock(return_value=None)
     coordinator.api.async_get_mute_status = AsyncMock(return_value="MUON")
 
     await hass.services.async_call(
@@ -93,12 +102,11 @@ async def test_mute_switch_turn_off_updates_state_immediately(hass, bypass_conne
     config_entry = await _setup_entry(hass)
     entity_id = _entity_id(hass, config_entry, "mute")
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator.data["mute"] = "MUON"
-    coordinator.async_update_listeners()
+    coordinator.async_set_updated_data(coordinator.data.update({"mute": "MUON"}))
     await hass.async_block_till_done()
     assert hass.states.get(entity_id).state == "on"
 
-    coordinator.api.async_mute_off = AsyncMock()
+    coordinator.api.async_mute_off = AsyncMock(return_value=None)
     coordinator.api.async_get_mute_status = AsyncMock(return_value="MUOFF")
 
     await hass.services.async_call(
@@ -109,3 +117,18 @@ async def test_mute_switch_turn_off_updates_state_immediately(hass, bypass_conne
     coordinator.api.async_mute_off.assert_awaited_once()
     assert hass.states.get(entity_id).state == "off"
 
+
+async def test_switch_skips_state_write_for_unrelated_fields(hass, bypass_connect):
+    """A switch should only write its state when the field it shows changes."""
+    config_entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    switch = DenonAvr3805MuteSwitch(coordinator, config_entry)
+    switch.async_write_ha_state = MagicMock()
+
+    coordinator.async_set_updated_data(coordinator.data.update({"volume": "MV40"}))
+    switch._handle_coordinator_update()
+    switch.async_write_ha_state.assert_not_called()
+
+    coordinator.async_set_updated_data(coordinator.data.update({"mute": "MUON"}))
+    switch._handle_coordinator_update()
+    switch.async_write_ha_state.assert_called_once()